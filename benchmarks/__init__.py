@@ -0,0 +1,3 @@
+"""
+Headless benchmarks of the data story pipeline (run with ``python -m benchmarks.pipeline``).
+"""
@@ -0,0 +1,134 @@
+"""
+Import-time report of the app's cold start.
+
+Collects the modules ``Streamlit.py`` imports at its top level (before anything
+renders), imports them in a fresh interpreter under ``python -X importtime``
+and reports the total startup import time and the most expensive modules, by
+their own (self) and cumulative time. With ``--baseline`` the total and every
+top-level module are compared to a stored report and the exit code is 1 when
+one of them got slower than the allowed ratio, e.g. when a heavy import such
+as ``plotly.express`` lands on the startup path again.
+
+    python -m benchmarks.imports --output benchmarks/imports.json      # store a baseline
+    python -m benchmarks.imports --baseline benchmarks/imports.json   # accept or reject a change
+
+Import times are noisy: the fastest of ``--repeat`` fresh interpreters is kept.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+
+from breaches.config import ROOT
+
+APP_SCRIPT = os.path.join(ROOT, 'Streamlit.py')
+
+# "import time:       392 |        850 |   plotly.graph_objects"
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def startup_modules(script=APP_SCRIPT):
+    """The modules the top level of ``script`` imports, in order (imports inside functions are lazy)."""
+    with open(script) as handle:
+        tree = ast.parse(handle.read(), script)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output into ``[{module, self_us, cumulative_us, depth}]``."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({'module': module, 'self_us': int(self_us),
+                            'cumulative_us': int(cumulative_us), 'depth': len(indent) // 2})
+    return entries
+
+
+def measure_imports(modules, repeat=3):
+    """Import ``modules`` in ``repeat`` fresh interpreters and return the entries of the fastest run."""
+    code = '; '.join('import %s' % module for module in modules)
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                                   stderr=subprocess.PIPE, universal_newlines=True, check=True)
+        entries = parse_importtime(completed.stderr)
+        total = sum(entry['cumulative_us'] for entry in entries if entry['depth'] == 0)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    return best
+
+
+def report(modules, repeat=3, top=15, label='startup imports of Streamlit.py'):
+    total_us, entries = measure_imports(modules, repeat)
+    top_level = {entry['module']: entry['cumulative_us'] for entry in entries if entry['depth'] == 0}
+    print('%s: %.1f ms' % (label, total_us / 1000))
+    for module in modules:
+        # A module imported earlier by another one costs nothing here
+        print('  %-55s %9.1f ms' % (module, top_level.get(module, 0) / 1000))
+    print('most expensive modules (self time):')
+    for entry in sorted(entries, key=lambda e: -e['self_us'])[:top]:
+        print('  %-55s %9.1f ms  (cumulative %.1f ms)'
+              % (entry['module'], entry['self_us'] / 1000, entry['cumulative_us'] / 1000))
+    return {'modules': modules, 'total_us': total_us, 'top_level_us': top_level, 'entries': entries}
+
+
+def compare(result, baseline, max_ratio, min_ms):
+    """Return the regressions of the total and of the top-level modules against ``baseline``."""
+    regressions = []
+    pairs = [('total', result['total_us'], baseline['total_us'])]
+    pairs += [(module, us, baseline['top_level_us'].get(module, 0))
+              for module, us in result['top_level_us'].items()]
+    for name, us, old_us in pairs:
+        # New or very cheap imports are reported against the noise floor instead of a ratio
+        if us / 1000 > min_ms and us > max_ratio * max(old_us, min_ms * 1000):
+            regressions.append({'module': name, 'ms': us / 1000, 'baseline_ms': old_us / 1000})
+            print('  %-55s %9.1f ms  (baseline %.1f ms)  <-- regression' % (name, us / 1000, old_us / 1000))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the import time of the app's cold start.")
+    parser.add_argument('modules', nargs='*', help='modules to import (default: the startup imports of Streamlit.py)')
+    parser.add_argument('--repeat', type=int, default=3, help='fresh interpreters, the fastest one is kept')
+    parser.add_argument('--top', type=int, default=15, help='most expensive modules to list')
+    parser.add_argument('--output', help='write the report as JSON')
+    parser.add_argument('--baseline', help='stored report to compare against')
+    parser.add_argument('--max-ratio', type=float, default=1.2,
+                        help='slowest accepted time ratio against the baseline')
+    parser.add_argument('--min-ms', type=float, default=5.0,
+                        help='imports faster than this are never reported as regressions')
+    args = parser.parse_args(argv)
+
+    if args.modules:
+        result = report(args.modules, args.repeat, args.top, label='imports of %s' % ', '.join(args.modules))
+    else:
+        result = report(startup_modules(), args.repeat, args.top)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(result, handle, indent=1)
+        print('wrote %s' % args.output, file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(result, json.load(handle), args.max_ratio, args.min_ms)
+        if regressions:
+            print('%d import(s) slower than x%.2f of the baseline' % (len(regressions), args.max_ratio),
+                  file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
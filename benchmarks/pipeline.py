@@ -0,0 +1,204 @@
+"""
+Benchmark of the data story pipeline at increasing scale.
+
+Runs the same stages as the app without a browser (load -> clean -> entity
+resolution -> index -> filter -> aggregate -> figure build) against datasets of increasing size
+and a few representative sidebar selections, and records the wall time and
+the peak traced memory of every stage in a JSON file. With ``--baseline`` the
+results are compared to a stored run and the exit code is 1 when a stage got
+slower than the allowed ratio, so the run can accept or reject a change.
+
+    python -m benchmarks.pipeline --output benchmarks/baseline.json   # store a baseline
+    python -m benchmarks.pipeline --baseline benchmarks/baseline.json  # accept or reject a change
+
+Baselines only compare runs on the same (quiet) machine. The datasets come
+from the seeded synthetic generator (breaches.synthetic) and are written once
+under benchmarks/data/, then reused.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from breaches.charts import annual_overview_figure, entity_comparison_figure, method_comparison_figure
+from breaches.cube import AggregationCube
+from breaches.dataset import clean_breaches, profile_raw, read_breaches
+from breaches.entities import EntityResolver
+from breaches.filter_index import FilterIndex
+from breaches.store import BreachDataset
+from breaches.synthetic import write_synthetic_csv
+from breaches.topk import top_breaches_per_year, top_entities_per_year
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, 'data')
+DEFAULT_SIZES = [300, 10_000, 1_000_000, 10_000_000]
+
+# Raw rows appended per incremental refresh in the 'append' stage
+APPEND_ROWS = 1000
+
+# Representative sidebar selections (None stands for the "All ..." option)
+SELECTIONS = {
+    'all': {'Year': None, 'Organization type': None, 'Method': None},
+    'one_year': {'Year': [2019], 'Organization type': None, 'Method': None},
+    'years_and_method': {'Year': [2013, 2014, 2015, 2016], 'Organization type': None, 'Method': ['Hacked']},
+    'org_types': {'Year': None, 'Organization type': ['Web', 'Healthcare', 'Financial'], 'Method': None},
+}
+
+
+def dataset_path(rows, seed=0):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, 'synthetic_%d_seed%d.csv' % (rows, seed))
+    if not os.path.exists(path):
+        write_synthetic_csv(path + '.tmp', rows, seed=seed)
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def measure(stage, func, results, meta, repeat=1):
+    """Keep the fastest of ``repeat`` untraced runs of ``func``, then trace one more for its peak memory.
+
+    tracemalloc slows down allocation heavy code (Plotly above all), so the times
+    come from untraced runs only.
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    gc.collect()
+    tracemalloc.start()
+    value = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    results.append(dict(meta, stage=stage, seconds=best, peak_mb=peak / 2 ** 20))
+    return value
+
+
+def run(sizes, repeat=1, seed=0, figures=True):
+    results = []
+    for rows in sizes:
+        path = dataset_path(rows, seed)
+        meta = {'rows': rows, 'selection': None}
+        print('rows=%d' % rows, file=sys.stderr)
+
+        raw = measure('load', partial(read_breaches, path), results, meta, repeat)
+        frame = measure('clean', partial(clean_breaches, raw), results, meta, repeat)
+        frame = measure('entity resolution', partial(_resolve, frame), results, meta, repeat)
+        index = measure('filter index build', partial(FilterIndex.build, frame), results, meta, repeat)
+        cube = measure('cube build', partial(AggregationCube.build, frame), results, meta, repeat)
+
+        # Incremental refresh: every run appends the last raw rows again to the latest version
+        # (all the rows of the datasets smaller than APPEND_ROWS)
+        latest = [BreachDataset(frame.copy(), profile_raw(raw), None)]
+        delta = raw.iloc[-APPEND_ROWS:]
+        measure('append %d rows' % len(delta), partial(_append, latest, delta), results, meta, repeat)
+
+        for name, selection in SELECTIONS.items():
+            meta = {'rows': rows, 'selection': name}
+            filtered = measure('filter', partial(_select, frame, index, selection), results, meta, repeat)
+            graph1 = measure('graph 1 aggregate', partial(_annual, cube, selection), results, meta, repeat)
+            graph2 = measure('graph 2 aggregate', partial(top_entities_per_year, filtered, 5),
+                             results, meta, repeat)
+            graph3 = measure('graph 3 aggregate', partial(top_breaches_per_year, filtered, 3),
+                             results, meta, repeat)
+            if figures:
+                years = selection['Year'] or index.values('Year')
+                measure('graph 1 figure', partial(annual_overview_figure, graph1), results, meta, repeat)
+                measure('graph 2 figure', partial(entity_comparison_figure, graph2, years), results, meta, repeat)
+                measure('graph 3 figure', partial(method_comparison_figure, graph3), results, meta, repeat)
+    return results
+
+
+def _resolve(frame):
+    return EntityResolver().resolve(frame)
+
+
+def _append(latest, delta):
+    latest[0] = latest[0].append(delta, None)
+
+
+def _annual(cube, selection):
+    return cube.annual(selection)[['Year', 'Records', 'Entities']]
+
+
+def _select(frame, index, selection):
+    mask = index.mask(selection)
+    return frame if mask is None else frame[mask]
+
+
+def environment():
+    return {
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        # ru_maxrss is in KiB on Linux (bytes on macOS)
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def compare(results, baseline, max_ratio, min_seconds):
+    """Print the time ratio of every stage against ``baseline`` and return the regressions."""
+    previous = {(r['rows'], r['selection'], r['stage']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get((result['rows'], result['selection'], result['stage']))
+        if old is None or not old['seconds']:
+            continue
+        ratio = result['seconds'] / old['seconds']
+        flag = ''
+        # Very short stages are too noisy to reject a change on
+        if ratio > max_ratio and result['seconds'] > min_seconds:
+            flag = '  <-- regression'
+            regressions.append(dict(result, baseline_seconds=old['seconds'], ratio=ratio))
+        print('%10d  %-18s %-20s %9.4fs  x%.2f%s' % (result['rows'], result['selection'] or '-',
+                                                     result['stage'], result['seconds'], ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the data story pipeline.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage, the fastest one is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-figures', action='store_true', help='skip the Plotly figure builds')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help='stored results to compare against')
+    parser.add_argument('--max-ratio', type=float, default=1.2,
+                        help='slowest accepted time ratio against the baseline')
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help='stages faster than this are never reported as regressions')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.seed, figures=not args.no_figures)
+    report = {'environment': environment(), 'results': results}
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=1)
+    print('wrote %s' % args.output, file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.max_ratio, args.min_seconds)
+        if regressions:
+            print('%d stage(s) slower than x%.2f of the baseline' % (len(regressions), args.max_ratio),
+                  file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
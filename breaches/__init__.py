@@ -0,0 +1,3 @@
+"""
+Data layer behind the data breach data story (Streamlit.py).
+"""
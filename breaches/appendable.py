@@ -0,0 +1,107 @@
+"""
+Cleaned breach frame that grows in place when rows are appended to the CSV.
+
+Every column lives in a numpy buffer with spare capacity at its end (the codes,
+for the categorical columns), and the frame of a dataset version is a zero-copy
+view of the first rows of the buffers. Appending writes the new rows behind
+the rows of the latest version and returns a frame over the longer view, so the
+frames that sessions still hold never change. A full buffer is doubled, which
+keeps the cost of an append proportional to the appended rows.
+
+The categories of new rows are added behind the existing ones, so the codes of
+the stored rows stay valid; the categories are therefore no longer sorted
+after an append.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _codes_dtype(n_categories):
+    # The code dtype pandas itself picks, so Categorical.from_codes() takes the buffer as it is
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _merge_categories(categories, values):
+    # I will add the new categories of ``values`` behind ``categories`` and recode its rows
+    values = pd.Categorical(values)
+    new = values.categories.difference(categories, sort=False)
+    if len(new):
+        categories = categories.append(new)
+    positions = categories.get_indexer(values.categories)
+    codes = np.asarray(values.codes)
+    if len(positions):
+        codes = np.where(codes >= 0, positions[codes], -1)
+    return codes.astype(_codes_dtype(len(categories))), categories
+
+
+class AppendableFrame:
+    """Column buffers with spare capacity, exposed as a zero-copy frame of their first rows."""
+
+    def __init__(self, buffers, categories, n_rows, end=None):
+        # {column: ndarray of at least n_rows values}, categorical columns hold their codes
+        self._buffers = buffers
+        # {column: pd.Index of the categories} of the categorical columns
+        self._categories = categories
+        self.n_rows = n_rows
+        # Rows written to the shared buffers; only the version that ends there may write behind it
+        self._end = end if end is not None else [n_rows]
+
+    @classmethod
+    def from_frame(cls, frame):
+        buffers, categories = {}, {}
+        for column in frame.columns:
+            values = frame[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                categories[column] = values.cat.categories
+                values = np.asarray(values.cat.codes)
+            buffers[column] = np.asarray(values)
+        return cls(buffers, categories, len(frame))
+
+    def frame(self):
+        """The rows of this version as a DataFrame over the buffers (no copy)."""
+        data = {}
+        for column, buffer in self._buffers.items():
+            values = buffer[:self.n_rows]
+            if column in self._categories:
+                values = pd.Categorical.from_codes(values, categories=self._categories[column])
+            data[column] = values
+        return pd.DataFrame(data, copy=False)
+
+    def replace(self, columns):
+        """Return these rows with the columns of ``columns`` (a frame of the same rows) in new buffers."""
+        replaced = AppendableFrame.from_frame(columns)
+        buffers = dict(self._buffers, **replaced._buffers)
+        categories = dict(self._categories, **replaced._categories)
+        for column in replaced._buffers:
+            if column not in replaced._categories:
+                categories.pop(column, None)
+        # The new buffers hold no spare rows, the next append grows them
+        return AppendableFrame(buffers, categories, self.n_rows, self._end)
+
+    def append(self, delta):
+        """Return the frame of these rows followed by the rows of ``delta`` (same columns)."""
+        n_rows = self.n_rows + len(delta)
+        owner = self._end[0] == self.n_rows
+        buffers, categories = {}, dict(self._categories)
+        for column, buffer in self._buffers.items():
+            if column in categories:
+                values, categories[column] = _merge_categories(categories[column], delta[column])
+            else:
+                values = delta[column].to_numpy(dtype=buffer.dtype)
+            if (not owner or n_rows > len(buffer) or values.dtype != buffer.dtype
+                    or not buffer.flags.writeable):
+                # A new buffer of twice the size; the old one stays with the older versions
+                grown = np.empty(max(n_rows, 2 * len(buffer)), dtype=values.dtype)
+                grown[:self.n_rows] = buffer[:self.n_rows]
+                buffer = grown
+            buffer[self.n_rows:n_rows] = values
+            buffers[column] = buffer
+
+        if not owner:
+            return AppendableFrame(buffers, categories, n_rows)
+        self._end[0] = n_rows
+        return AppendableFrame(buffers, categories, n_rows, self._end)
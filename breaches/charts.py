@@ -0,0 +1,186 @@
+"""
+Plotly figures of the data story.
+
+Each function takes the small, already aggregated frame of its graph and
+returns the styled figure, so the app can cache the result per filter selection.
+"""
+
+import plotly.express as px
+
+
+def annual_overview_figure(graph1):
+    """Graph 1: area plot of the users affected per year ('Year', 'Records' in millions), with the
+    breached organizations per year on a secondary axis when graph1 has an 'Entities' column."""
+    # I will create an interactive area plot using Plotly
+    fig = px.area(graph1, x="Year", y="Records",
+                  title="Annual Overview: Users Affected by Data Breaches",
+                  labels={"Records": "Users Affected (in millions)"})
+
+    # I will customize the layout of the Plotly graph
+    fig.update_traces(
+        line=dict(color='#ff4b4b'),  # Setting the line color to red
+        fill='tozeroy',  # Filling the area below the line
+        mode='lines+markers',  # Displaying lines with markers
+        marker=dict(color='white', size=5)  # Customizing marker color and size
+    )
+
+    # Customizing the plot background to dark
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',  # Set to transparent for a darker theme
+        paper_bgcolor='rgba(0,0,0,1)',  # Set to dark for a darker theme
+        font=dict(color='white'),  # Set font color to white for visibility
+        xaxis=dict(
+            title='Year',
+            showgrid=False,  # Hide gridlines
+            gridcolor='grey',  # Set gridlines color to grey
+            tickmode='linear'  # Set x-axis tick mode to linear
+        ),
+        yaxis=dict(
+            title='Users Affected',
+            showgrid=False,  # Hide gridlines
+            gridcolor='grey',  # Set gridlines color to grey
+            type='log',  # Using a logarithmic scale for the y-axis
+            tickvals=[0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000],  # Setting tick values
+            ticktext=['500K', '1M', '2M', '5M', '10M', '20M', '50M', '100M', '200M', '500M', '1B', '2B', '5B']  # Setting tick labels
+        ),
+        title_x=0.3,  # Center the title
+        legend_title_text='Method',  # Set legend title
+        legend=dict(
+            bgcolor='rgba(0,0,0,0.5)',  # Set legend background to semi-transparent black
+            bordercolor='rgba(255,255,255,0.5)',  # Set legend border to semi-transparent white
+        ),
+        template="plotly_dark",  # Use the dark theme template for the plot
+    )
+
+    # An empty selection has no area trace to name
+    if 'Entities' in graph1 and fig.data:
+        # I will add the (estimated) distinct organizations per year as a line on a right-hand axis
+        fig.data[0].name = 'Users Affected'
+        fig.add_scatter(x=graph1['Year'], y=graph1['Entities'].round(), yaxis='y2',
+                        name='Organizations Breached', mode='lines+markers',
+                        line=dict(color='#f0c808', dash='dot'), marker=dict(size=5),
+                        hovertemplate='Year: %{x}<br>Organizations breached: ~%{y:,.0f}<extra></extra>')
+        fig.update_layout(
+            yaxis2=dict(
+                title='Organizations Breached',
+                overlaying='y',  # Share the x-axis with the area plot
+                side='right',
+                showgrid=False,  # Hide gridlines
+                rangemode='tozero',  # Counts start at zero
+            ),
+            showlegend=True,
+            legend=dict(orientation='h', yanchor='bottom', y=1.0, xanchor='right', x=1.0),
+        )
+
+    return fig
+
+
+def entity_comparison_figure(graph2, selected_years):
+    """Graph 2: scatter plot of the top entities per year ('Records (millions)' per Entity and Year)."""
+    # I will also calculate the sizes for the plot, with a cap for extremely large values such as (Yahoo)
+    max_size = 1000  # I will set a maximum size cap for extremely large breaches
+    scaled_sizes = graph2['Records (millions)'].clip(upper=max_size)
+
+    # I will create a scatter plot with Plotly using the filtered top K data
+    fig2 = px.scatter(
+        graph2,
+        x='Year',
+        y='Records (millions)',
+        color='Entity_canonical_short',
+        size=scaled_sizes,  # Use scaled sizes with a cap
+        title="Comparative Analysis: Users Affected by Data Breaches by Entity and Selected Years",
+        labels={"Records (millions)": "Users Affected (in millions)",
+                "Entity_canonical_short" : "Entity" ,
+                "size" : "Size"},
+        hover_name='Entity_canonical',  # Show full entity name on hover
+        category_orders={"Year": selected_years}  # Ensure that only the selected years are shown
+    )
+
+    # I will customize the layout for improved readability and aesthetics
+    fig2.update_layout(
+        xaxis_title="Year",
+        yaxis_title="Users Affected",
+        title_x=0.5,  # Center the title
+        plot_bgcolor="rgba(0,0,0,1)",  # Dark background inside the plot area
+        paper_bgcolor="rgba(0,0,0,1)",  # Dark background for the whole figure
+        font=dict(color="white"),  # Text color
+        yaxis=dict(
+            type='log',  # Use a logarithmic scale due to the large range of values
+            tickvals=[0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000],
+            ticktext=['500K', '1M', '2M', '5M', '10M', '20M', '50M', '100M', '200M', '500M', '1B', '2B', '5B'],
+            gridcolor='grey',  # Set gridlines color to grey
+            showgrid=True,  # Show gridlines
+        ),
+        legend_title="Entity",
+        legend=dict(
+            bgcolor='rgba(0,0,0,0.5)',  # Semi-transparent background for the legend
+            bordercolor='rgba(255,255,255,0.5)',  # Semi-transparent border for the legend
+        ),
+        xaxis=dict(
+            showgrid=False,  # Hide gridlines
+            gridcolor='grey',  # Set gridlines color to grey
+        ),
+        template="plotly_dark",  # Use the dark theme template for the plot
+    )
+
+    return fig2
+
+
+def method_comparison_figure(graph3):
+    """Graph 3: stacked bars of the top breaches per year by method and entity."""
+    # I will sort the graph3 DataFrame alphabetically by 'Entity_canonical_short'
+    graph3 = graph3.sort_values(by='Entity_canonical_short')
+
+    # I will now create the stacked bar chart with the sorted graph3 DataFrame
+    fig3 = px.bar(
+        graph3,
+        x='Entity_canonical_short',  # Use 'Entity_canonical_short' for the x-axis
+        y='Records (millions)',
+        color='Method',  # Use 'Method' to color the bars
+        title="Comparative Analysis: User Breached by Method and Entity",
+        labels={"Records (millions)": "Users Affected (in millions)",
+                "Entity_canonical_short": "Entity",
+                "Method": "Data Breach Method"},
+        barmode='stack',  # Bars will be stacked on top of each other
+        hover_name='Entity_canonical',  # Show full entity name on hover
+    )
+
+    # I will customize the layout for a logarithmic scale with custom tick values for readability and scalability reasons
+    fig3.update_layout(
+        xaxis_title="Entity",
+        title_x=0.2,  # Center the title
+        yaxis_title="Users Affected",
+        plot_bgcolor="rgba(0,0,0,1)",  # Dark background inside the plot area
+        paper_bgcolor="rgba(0,0,0,1)",  # Dark background for the whole figure
+        font=dict(color="white"),  # Text color
+        yaxis=dict(
+            type='log',  # Use a logarithmic scale due to the large range of values
+            tickvals=[0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000],
+            ticktext=['500K', '1M', '2M', '5M', '10M', '20M', '50M', '100M', '200M', '500M', '1B', '2B', '5B'],
+            gridcolor='grey',  # Set gridlines color to grey
+            showgrid=True,  # Show gridlines
+        ),
+        legend_title="Data Breach Method",
+        legend=dict(
+            bgcolor='rgba(0,0,0,0.5)',  # Semi-transparent background for the legend
+            bordercolor='rgba(255,255,255,0.5)',  # Semi-transparent border for the legend
+        ),
+        xaxis=dict(
+            showgrid=False,  # Hide gridlines
+            gridcolor='grey',  # Set gridlines color to grey
+            categoryorder='array',  # Enforce the order of x-axis categories
+            categoryarray=sorted(graph3['Entity_canonical_short'].unique())  # The sorted order of entities
+        ),
+        template="plotly_dark",  # Use the dark theme template for the plot
+    )
+
+    return fig3
+
+
+def highlight_entities(fig, entities):
+    """Outline the points (Graph 2) or bars (Graph 3) of the named entities in white."""
+    # The full entity name of every point is its hover name
+    entities = set(entities)
+    for trace in fig.data:
+        trace.marker.line = dict(color='white', width=[3 if name in entities else 0 for name in trace.hovertext])
+    return fig
@@ -0,0 +1,35 @@
+"""
+Runtime configuration of the data story, read from environment variables.
+
+BREACHES_DATA_PATH   dataset CSV, or a directory / glob pattern of CSV shards
+                     (default: data_breaches.csv next to Streamlit.py)
+BREACHES_LOAD_WORKERS  processes that clean the shards of a sharded dataset
+                     (default: one per core)
+BREACHES_INGEST      'memory' keeps the cleaned rows in memory (default),
+                     'stream' reads the CSV in chunks and keeps only aggregates
+                     'sqlite' cleans the CSV into a SQLite file next to it and
+                     runs the filters and aggregations as SQL queries
+BREACHES_CHUNK_ROWS  rows per chunk of the streaming ingest
+BREACHES_REFRESH     'append' parses only the rows appended to the CSV since the
+                     last load (default), 'full' always reloads the whole file
+BREACHES_TIMING_LOG  JSON lines log of the rerun timings (default: timings.jsonl
+                     next to Streamlit.py), '' switches the log off
+BREACHES_TIMING_LOG_MAX_BYTES  size from which the timing log is rotated to
+                     timings.jsonl.1 (default: 10 MB, 0 never rotates)
+"""
+
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_PATH = os.environ.get('BREACHES_DATA_PATH', os.path.join(ROOT, 'data_breaches.csv'))
+INGEST = os.environ.get('BREACHES_INGEST', 'memory')
+CHUNK_ROWS = int(os.environ.get('BREACHES_CHUNK_ROWS', 200_000))
+REFRESH = os.environ.get('BREACHES_REFRESH', 'append')
+LOAD_WORKERS = int(os.environ.get('BREACHES_LOAD_WORKERS', os.cpu_count() or 1))
+# Local JSON lines log of the reruns ('' switches logging off), rotated from the given size (0 never)
+TIMING_LOG = os.environ.get('BREACHES_TIMING_LOG', os.path.join(ROOT, 'timings.jsonl'))
+TIMING_LOG_MAX_BYTES = int(os.environ.get('BREACHES_TIMING_LOG_MAX_BYTES', 10 * 1024 * 1024))
+
+# Largest K of the entity graphs, which the streaming aggregates have to keep per cell
+MAX_TOP_K = 30
@@ -0,0 +1,125 @@
+"""
+Pre-aggregated Year × Organization type × Method cube of the breach records.
+
+The cube is computed once per dataset version and holds, for every cell that
+occurs in the data, the number of breaches, the sum and maximum of 'Records',
+a quantile sketch of 'Records' and a distinct count sketch of the entities. Any
+sidebar selection is answered by slicing and summing (or merging) the cells (at
+most a few thousand rows), so the annual chart, the totals and the Records
+summary never touch the row-level data.
+"""
+
+import numpy as np
+import pandas as pd
+
+from breaches.distinct import DistinctSketch, entity_hashes
+from breaches.entities import entity_keys
+from breaches.filter_index import FILTER_COLUMNS
+from breaches.sketch import QuantileSketch
+from breaches.year_range import YearRangeSums
+
+
+def slice_cells(frame, selection):
+    """Rows of ``frame`` inside ``selection`` (a filter column -> values mapping, None for all)."""
+    keep = np.ones(len(frame), dtype=bool)
+    for column, values in selection.items():
+        if values is not None:
+            keep &= frame[column].isin(values).to_numpy()
+    return frame[keep]
+
+
+class AggregationCube:
+    """Breaches, Records sum, max and sketch, and entities sketch per (Year, Organization type, Method)."""
+
+    def __init__(self, cells):
+        # One row per non-empty cell: the FILTER_COLUMNS plus 'Breaches', 'Records', 'Largest', 'Sketch'
+        # and 'Entities'
+        self.cells = cells
+        self._year_range_sums = None
+
+    @classmethod
+    def build(cls, frame):
+        records = frame['Records'].astype(np.float64)
+        groups = records.groupby([frame[col] for col in FILTER_COLUMNS], observed=True)
+        cells = groups.agg(Breaches='size', Records='sum', Largest='max').reset_index()
+        # The group numbers follow the same sorted order as the aggregated cells; the rows of a
+        # missing key are in no cell (ngroup gives them -1, or NaN on newer pandas), and the
+        # sketches leave out the rows of group -1
+        cell_codes = groups.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        cells['Sketch'] = QuantileSketch.grouped(records.to_numpy(), cell_codes, len(cells))
+        # The entity keys are hashed rather than the canonical entities, which a later append may
+        # merge: the sketch of a cell never has to change once built
+        cells['Entities'] = DistinctSketch.grouped(entity_hashes(entity_keys(frame['Entity'])),
+                                                   cell_codes, len(cells))
+        return cls(cells)
+
+    @classmethod
+    def combine(cls, cubes):
+        """Merge the cubes of disjoint parts of a dataset (e.g. CSV chunks) into one.
+
+        Only the sketches of the cells that occur in more than one cube are merged; the sketches
+        of the other cells are shared with the cube they come from (sketches are never changed
+        once in a cube), so appending a small cube costs about the cells it has."""
+        cells = pd.concat([cube.cells for cube in cubes], ignore_index=True)
+        cells = cells.astype({col: 'category' for col in FILTER_COLUMNS if col != 'Year'})
+        groups = cells.groupby(list(FILTER_COLUMNS), observed=True)
+        merged = groups.agg(Breaches=('Breaches', 'sum'), Records=('Records', 'sum'),
+                            Largest=('Largest', 'max')).reset_index()
+
+        # The parts of merged cell c are the rows order[starts[c]:starts[c + 1]] of the cells
+        order = np.argsort(groups.ngroup().to_numpy(), kind='stable')
+        starts = np.r_[0, np.cumsum(groups.size().to_numpy())]
+        sketches, entities = cells['Sketch'].to_numpy(), cells['Entities'].to_numpy()
+        merged_sketches, merged_entities = [], []
+        for start, stop in zip(starts[:-1], starts[1:]):
+            parts = order[start:stop]
+            if len(parts) == 1:
+                merged_sketches.append(sketches[parts[0]])
+                merged_entities.append(entities[parts[0]])
+            else:
+                merged_sketches.append(QuantileSketch.merged(sketches[parts]))
+                merged_entities.append(DistinctSketch.merged(entities[parts]))
+        merged['Sketch'] = merged_sketches
+        merged['Entities'] = merged_entities
+        return cls(merged)
+
+    def values(self, column):
+        """Sorted distinct values of a filter column."""
+        return sorted(self.cells[column].unique().tolist())
+
+    def slice(self, selection):
+        """Return the cells of ``selection`` (a filter column -> values mapping, None for all)."""
+        return slice_cells(self.cells, selection)
+
+    def annual(self, selection):
+        """Breaches, Records, Largest and (estimated distinct) Entities per year of the selection,
+        sorted by year."""
+        groups = self.slice(selection).groupby('Year')
+        annual = groups.agg(Breaches=('Breaches', 'sum'), Records=('Records', 'sum'), Largest=('Largest', 'max'))\
+            .reset_index()
+        annual['Entities'] = annual['Year'].map(self.annual_entities(selection))
+        return annual
+
+    def annual_entities(self, selection):
+        """Estimated distinct entities per year of the selection, from the merged cell sketches."""
+        return pd.Series({year: DistinctSketch.merged(sketches).count()
+                          for year, sketches in self.slice(selection).groupby('Year')['Entities']}, dtype='float64')
+
+    def year_range_sums(self):
+        """The prefix sums of the cells over the years, laid out on first use."""
+        if self._year_range_sums is None:
+            self._year_range_sums = YearRangeSums.from_cells(self.cells)
+        return self._year_range_sums
+
+    def totals(self, selection):
+        """Breaches, Records and Largest over the whole selection."""
+        cells = self.slice(selection)
+        return {
+            'Breaches': int(cells['Breaches'].sum()),
+            'Records': float(cells['Records'].sum()),
+            'Largest': float(cells['Largest'].max()) if len(cells) else 0.0,
+        }
+
+    def summary(self, selection):
+        """The Records summary of ``Series.describe()`` over the selection, from the merged cell sketches."""
+        return QuantileSketch.merged(self.slice(selection)['Sketch']).describe()
@@ -0,0 +1,375 @@
+"""
+SQLite backend: the cleaned breaches in a local database file, queried per rerun.
+
+With ``BREACHES_INGEST=sqlite`` the CSV is cleaned chunk by chunk (the same
+``clean_breaches`` rules) into a SQLite file next to it, with an index on each
+of the three filter columns and on the entity names (for the entity search).
+``SqliteDataset`` then answers the queries of the app in SQL: the sidebar
+filters become a WHERE clause, Graph 1 and the totals a GROUP BY, and the
+top-K of Graphs 2 and 3 a ``ROW_NUMBER()`` window per year. The Records
+quantile sketches and the distinct entity sketches of the cube cells are stored
+in a table of their own, so the Records summary and the distinct entities of a
+selection merge a few sketches instead of reading rows. The entity names of all
+chunks are resolved once the rows are in, into an ``entities`` table of every
+name and its canonical entity, which labels the rows with one UPDATE. The SQL
+sticks to what SQLite 3.25 understands (window functions), so the system
+SQLite of older distributions runs it too.
+Only the query results are held in memory, so large archives are served with
+a small footprint at the price of a query per figure cache miss.
+
+The database is rebuilt when the digest of the CSV it was built from changes,
+or when it was written with another layout of the tables.
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import pandas_dtype
+
+from breaches.config import CHUNK_ROWS
+from breaches.cube import AggregationCube
+from breaches.dataset import SNAPSHOT_VERSION, clean_breaches
+from breaches.distinct import DistinctSketch
+from breaches.entities import EntityResolver
+from breaches.entity_search import EntityIndex
+from breaches.explorer import EXPLORER_COLUMNS
+from breaches.sketch import QuantileSketch
+from breaches.year_range import YearRangeSums
+from breaches.streaming import _COMBINE_EVERY, RawProfile
+
+# Cleaned frame column -> SQL column
+SQL_COLUMNS = {
+    'Entity': 'entity',
+    'Entity_short': 'entity_short',
+    'Year': 'year',
+    'Records': 'records',
+    'Organization type': 'organization_type',
+    'Method': 'method',
+    'Entity_canonical': 'entity_canonical',
+    'Entity_canonical_short': 'entity_canonical_short',
+    'Entity_id': 'entity_id',
+}
+
+# Layout of the database file; a file of another layout is rebuilt
+_SCHEMA_VERSION = 6
+
+_SCHEMA = """
+CREATE TABLE breaches (
+    entity TEXT,
+    year INTEGER NOT NULL,
+    records REAL,
+    organization_type TEXT,
+    method TEXT,
+    entity_short TEXT,
+    entity_canonical TEXT,
+    entity_canonical_short TEXT,
+    entity_id INTEGER
+);
+CREATE TABLE entities (
+    entity TEXT PRIMARY KEY,
+    entity_canonical TEXT NOT NULL,
+    entity_canonical_short TEXT NOT NULL,
+    entity_id INTEGER NOT NULL
+);
+CREATE TABLE cells (
+    year INTEGER NOT NULL,
+    organization_type TEXT,
+    method TEXT,
+    sketch TEXT NOT NULL,
+    entities BLOB NOT NULL
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_INDEXES = """
+CREATE INDEX breaches_year ON breaches (year);
+CREATE INDEX breaches_organization_type ON breaches (organization_type);
+CREATE INDEX breaches_method ON breaches (method);
+CREATE INDEX breaches_entity_canonical ON breaches (entity_canonical);
+"""
+
+
+def database_path(path):
+    """The SQLite file of the dataset at ``path`` (a CSV, or a directory or glob of shards)."""
+    if os.path.isdir(path):
+        base = os.path.join(path, 'breaches')
+    elif glob.has_magic(path):
+        base = os.path.join(os.path.dirname(path), 'breaches')
+    else:
+        base = os.path.splitext(path)[0]
+    return '%s.clean-v%d.sqlite' % (base, SNAPSHOT_VERSION)
+
+
+def build_database(paths, db_path, digest, chunk_rows=CHUNK_ROWS):
+    """Clean the CSV files ``paths`` chunk by chunk into a new database at ``db_path``."""
+    tmp = '%s.%d.tmp' % (db_path, os.getpid())
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    profile = RawProfile()
+    entity_resolver = EntityResolver()
+    cubes = []
+    rows = 0
+    # The dtypes of the cleaned columns, which SQL reads back as objects and floats
+    dtypes = {}
+    try:
+        # closing() closes the file even when the build raises (the with block of a connection
+        # only commits or rolls back)
+        with closing(sqlite3.connect(tmp)) as conn, conn:
+            conn.executescript(_SCHEMA)
+            for path in paths:
+                for raw in pd.read_csv(path, chunksize=chunk_rows):
+                    profile.update(raw)
+                    chunk = clean_breaches(raw)
+                    entity_resolver.add_entities(chunk['Entity'])
+                    if not dtypes:
+                        resolved = entity_resolver.resolve(chunk.iloc[:0], add=False)
+                        dtypes = {col: str(dtype) for col, dtype in resolved.dtypes.items()}
+                    rows += len(chunk)
+                    # Only the cell sketches are kept (the other aggregates are GROUP BY queries),
+                    # combined every so many chunks like the streamed cube
+                    cubes.append(AggregationCube.build(chunk))
+                    if len(cubes) > _COMBINE_EVERY:
+                        cubes = [AggregationCube.combine(cubes)]
+                    chunk = chunk.astype({col: object for col in chunk.columns
+                                          if isinstance(chunk[col].dtype, pd.CategoricalDtype)})
+                    chunk.rename(columns=SQL_COLUMNS).to_sql('breaches', conn, if_exists='append',
+                                                            index=False)
+            if cubes:
+                cube = AggregationCube.combine(cubes)
+                conn.executemany('INSERT INTO cells VALUES (?, ?, ?, ?, ?)', [
+                    (int(year), organization_type, method, json.dumps(sketch.to_dict()), entities.to_bytes())
+                    for year, organization_type, method, sketch, entities
+                    in cube.cells[['Year', 'Organization type', 'Method', 'Sketch', 'Entities']]
+                    .itertuples(index=False)])
+            # The entities depend on the names of all chunks, so the rows are labeled after the inserts
+            conn.executemany('INSERT INTO entities VALUES (?, ?, ?, ?)',
+                             entity_resolver.table().itertuples(index=False, name=None))
+            # (a correlated subquery on the primary key of entities; UPDATE ... FROM needs SQLite 3.33)
+            conn.execute('UPDATE breaches SET (entity_canonical, entity_canonical_short, entity_id) = '
+                         '(SELECT entity_canonical, entity_canonical_short, entity_id FROM entities '
+                         'WHERE entities.entity = breaches.entity)')
+            # Building the indexes once after the inserts is much cheaper than keeping them up to date
+            conn.executescript(_INDEXES)
+            conn.executemany('INSERT INTO meta VALUES (?, ?)', [
+                ('digest', digest),
+                ('schema', str(_SCHEMA_VERSION)),
+                ('rows', str(rows)),
+                ('profile', json.dumps(profile.to_dict())),
+                ('dtypes', json.dumps(dtypes)),
+            ])
+        os.replace(tmp, db_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _connect_read_only(db_path):
+    # The path is quoted, so a '?', '#' or '%' in it is not read as part of the URI
+    return sqlite3.connect('file:%s?mode=ro' % quote(os.path.abspath(db_path)), uri=True)
+
+
+def _database_digest(db_path):
+    # The digest of the CSV the database was built from, None for a missing file or an old layout
+    try:
+        with closing(_connect_read_only(db_path)) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('digest', 'schema')"))
+    except sqlite3.Error:
+        return None
+    return meta.get('digest') if meta.get('schema') == str(_SCHEMA_VERSION) else None
+
+
+def _where(selection):
+    # I will turn a filter selection into a WHERE clause with one parameter per selected value
+    clauses, params = [], []
+    for column, values in selection.items():
+        if values is None:
+            continue
+        if not len(values):
+            return 'WHERE 0', []
+        clauses.append('%s IN (%s)' % (SQL_COLUMNS[column], ', '.join('?' * len(values))))
+        params.extend(int(v) if isinstance(v, (int, np.integer)) else v for v in values)
+    return ('WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+
+class SqliteCube:
+    """The ``cube.AggregationCube`` queries of the app, as GROUP BY queries."""
+
+    def __init__(self, dataset):
+        self._dataset = dataset
+        self._year_range_sums = None
+
+    def annual(self, selection):
+        """Breaches, Records, Largest and (estimated distinct) Entities per year of the selection,
+        sorted by year."""
+        where, params = _where(selection)
+        annual = self._dataset.query(
+            'SELECT year AS "Year", COUNT(*) AS "Breaches", TOTAL(records) AS "Records", '
+            'MAX(records) AS "Largest" FROM breaches %s GROUP BY year ORDER BY year' % where, params)
+        annual['Entities'] = annual['Year'].map(self.annual_entities(selection))
+        return annual
+
+    def annual_entities(self, selection):
+        """Estimated distinct entities per year of the selection, from the merged cell sketches."""
+        where, params = _where(selection)
+        cells = self._dataset.query('SELECT year AS "Year", entities FROM cells %s' % where, params)
+        return pd.Series({year: DistinctSketch.merged(DistinctSketch.from_bytes(data) for data in group).count()
+                          for year, group in cells.groupby('Year')['entities']}, dtype='float64')
+
+    def year_range_sums(self):
+        """The prefix sums of the cells over the years, from one GROUP BY on first use."""
+        if self._year_range_sums is None:
+            self._year_range_sums = YearRangeSums.from_cells(self._dataset.query(
+                'SELECT year AS "Year", organization_type AS "Organization type", method AS "Method", '
+                'COUNT(*) AS "Breaches", TOTAL(records) AS "Records", MAX(records) AS "Largest" '
+                'FROM breaches GROUP BY year, organization_type, method'))
+        return self._year_range_sums
+
+    def totals(self, selection):
+        """Breaches, Records and Largest over the whole selection."""
+        where, params = _where(selection)
+        breaches, records, largest = self._dataset.execute(
+            'SELECT COUNT(*), TOTAL(records), MAX(records) FROM breaches %s' % where, params).fetchone()
+        return {'Breaches': int(breaches), 'Records': float(records), 'Largest': float(largest or 0.0)}
+
+    def summary(self, selection):
+        """The Records summary of ``Series.describe()`` over the selection, from the merged cell sketches."""
+        where, params = _where(selection)
+        rows = self._dataset.execute('SELECT sketch FROM cells %s' % where, params).fetchall()
+        return QuantileSketch.merged(QuantileSketch.from_dict(json.loads(sketch)) for sketch, in rows).describe()
+
+    def values(self, column):
+        """Sorted distinct values of a filter column."""
+        sql_column = SQL_COLUMNS[column]
+        rows = self._dataset.execute('SELECT DISTINCT %s FROM breaches WHERE %s IS NOT NULL ORDER BY %s'
+                                     % (sql_column, sql_column, sql_column)).fetchall()
+        return [value for value, in rows]
+
+
+class SqliteDataset:
+    """Breach dataset in a SQLite file, with the same query methods as ``store.BreachDataset``."""
+
+    has_rows = True
+    # A changed CSV is built into a new database file, never appended to
+    source = None
+
+    def __init__(self, db_path, version):
+        self.db_path = db_path
+        self.version = version
+        # sqlite3 connections belong to the thread that opened them, and Streamlit runs
+        # every session in its own thread
+        self._local = threading.local()
+        self.cube = SqliteCube(self)
+        meta = dict(self.execute('SELECT key, value FROM meta').fetchall())
+        self.profile = json.loads(meta['profile'])
+        self._rows = int(meta['rows'])
+        self._dtypes = pd.Series({col: pandas_dtype(dtype) for col, dtype in json.loads(meta['dtypes']).items()},
+                                 dtype=object)
+        self._entity_index = None
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = _connect_read_only(self.db_path)
+            self._local.conn = conn
+        return conn
+
+    def execute(self, sql, params=()):
+        return self._connection().execute(sql, params)
+
+    def query(self, sql, params=()):
+        return pd.read_sql_query(sql, self._connection(), params=params)
+
+    def __len__(self):
+        return self._rows
+
+    @property
+    def dtypes(self):
+        """The dtypes of the cleaned columns (those of the in-memory frame), not of a SQL read."""
+        return self._dtypes
+
+    def values(self, column):
+        return self.cube.values(column)
+
+    def sample(self, n, columns, random_state=None):
+        # The rows were inserted once, so the rowids run from 1 to the number of rows
+        rowids = np.random.default_rng(random_state).choice(
+            self._rows, size=min(n, self._rows), replace=False) + 1
+        select = ', '.join('%s AS "%s"' % (SQL_COLUMNS[col], col) for col in columns)
+        return self.query('SELECT %s FROM breaches WHERE rowid IN (%s)'
+                          % (select, ', '.join('?' * len(rowids))), [int(r) for r in rowids])
+
+    def top_entities(self, selection, k):
+        """Graph 2 data: the ``k`` entities with the most records per year of the selection."""
+        where, params = _where(selection)
+        # Ties are broken by entity name, the order of the groups of the pandas path
+        return self.query("""
+            WITH totals AS (
+                SELECT entity_canonical, entity_canonical_short, year, TOTAL(records) AS records
+                FROM breaches %s GROUP BY entity_canonical, entity_canonical_short, year
+            ), ranked AS (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY year ORDER BY records DESC, entity_canonical, entity_canonical_short) AS position
+                FROM totals
+            )
+            SELECT entity_canonical AS "Entity_canonical", entity_canonical_short AS "Entity_canonical_short",
+                   year AS "Year", records AS "Records (millions)"
+            FROM ranked WHERE position <= ? ORDER BY year, position
+        """ % where, params + [int(k)])
+
+    def top_breaches(self, selection, k):
+        """Graph 3 data: the ``k`` largest breaches per year of the selection."""
+        where, params = _where(selection)
+        where = (where + ' AND' if where else 'WHERE') + ' records IS NOT NULL'
+        # Ties are broken by rowid, i.e. by their order in the CSV like in the pandas path
+        return self.query("""
+            WITH ranked AS (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY year ORDER BY records DESC, rowid) AS position
+                FROM breaches %s
+            )
+            SELECT entity AS "Entity", year AS "Year", records AS "Records (millions)",
+                   organization_type AS "Organization type", method AS "Method",
+                   entity_short AS "Entity_short", entity_canonical AS "Entity_canonical",
+                   entity_canonical_short AS "Entity_canonical_short", entity_id AS "Entity_id"
+            FROM ranked WHERE position <= ? ORDER BY year, position
+        """ % where, params + [int(k)])
+
+    def page(self, selection, sort_by, ascending=True, start=0, size=50):
+        """Explorer data: rows ``start:start + size`` of the selection sorted by ``sort_by``,
+        and the number of rows in the selection."""
+        where, params = _where(selection)
+        select = ', '.join('%s AS "%s"' % (SQL_COLUMNS[col], col) for col in EXPLORER_COLUMNS)
+        # Missing values last and ties in CSV order, like the pandas path (without NULLS LAST, which
+        # needs SQLite 3.30)
+        column = SQL_COLUMNS[sort_by]
+        rows = self.query('SELECT %s FROM breaches %s ORDER BY %s IS NULL, %s %s, rowid LIMIT ? OFFSET ?'
+                          % (select, where, column, column, 'ASC' if ascending else 'DESC'),
+                          params + [int(size), int(start)])
+        return rows, self.cube.totals(selection)['Breaches']
+
+    def entity_index(self):
+        """The prefix index of the (canonical) entity names, built on first use."""
+        if self._entity_index is None:
+            names = self.execute('SELECT DISTINCT entity_canonical FROM entities').fetchall()
+            self._entity_index = EntityIndex.build(name for name, in names)
+        return self._entity_index
+
+    def entity_breaches(self, entities):
+        """The breaches of the named (canonical) entities, by year."""
+        entities = list(entities)
+        select = ', '.join('%s AS "%s"' % (SQL_COLUMNS[col], col) for col in EXPLORER_COLUMNS)
+        return self.query('SELECT %s FROM breaches WHERE entity_canonical IN (%s) ORDER BY year, rowid'
+                          % (select, ', '.join('?' * len(entities))), entities)
+
+
+def load_database(paths, db_path, digest):
+    """Return the SqliteDataset of ``paths``, (re)building its database when the digest changed."""
+    if _database_digest(db_path) != digest:
+        build_database(paths, db_path, digest)
+    return SqliteDataset(db_path, digest)
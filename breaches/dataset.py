@@ -0,0 +1,317 @@
+"""
+Loading and cleaning of the data breach dataset.
+
+Streamlit reruns the whole script on every widget interaction, so the app does
+not read the CSV directly: it asks for the file fingerprint (path, size,
+modification time and content hash) and memoizes the cleaned frame on it.
+Only a changed file triggers a reload.
+
+When rows are only appended to the CSV, the content hash is resumed from the
+hash state of the previous size and ``read_appended`` parses just the new
+bytes, so a refresh costs as much as the appended rows. The prefix of the file
+is verified with ``prefix_checksum`` first; a file that was rewritten instead of
+appended to is hashed and reloaded in full.
+
+A fresh server process does not have to parse the CSV either: the cleaned frame
+is written to a typed Parquet snapshot next to the CSV (together with a small
+JSON profile of the raw file for the Data Cleaning expander) and read back from
+there as long as it is not older than the CSV and the profile holds the content
+hash of the CSV (a CSV replaced with a preserved or older mtime, e.g. by
+``cp -p``, ``rsync -t`` or a restore, has another hash). A stale snapshot is
+rebuilt automatically, or ahead of time with ``python -m breaches.dataset``.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from breaches.config import DATA_PATH
+from breaches.sketch import QuantileSketch
+
+# Identity of a dataset file, used as the cache key of the loaders
+Fingerprint = namedtuple('Fingerprint', ['path', 'size', 'mtime_ns', 'digest'])
+
+# Content hashes keyed on (path, size, mtime) so an unchanged file is hashed only once
+_digests = {}
+
+# Last hashed size of every path, with its sha256 state and prefix checksum, to resume from
+_hash_states = {}
+
+# Bytes at the start and at the end of a prefix that prefix_checksum() reads
+PREFIX_WINDOW = 1 << 16
+
+
+def prefix_checksum(path, offset, window=PREFIX_WINDOW):
+    """Checksum of the first ``offset`` bytes of ``path``, from their first and last ``window`` bytes.
+
+    Reading the two windows keeps the check independent of the file size: a
+    rewritten header, a truncated file or a changed last row before ``offset``
+    change the checksum, an edit in the middle of a large file does not.
+    """
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size < offset:
+            # The file was truncated below the prefix
+            return None
+        head = handle.read(min(window, offset))
+        handle.seek(max(offset - window, 0))
+        tail = handle.read(offset - max(offset - window, 0))
+    sha = hashlib.sha256(b'%d:' % offset)
+    sha.update(head)
+    sha.update(tail)
+    return sha.hexdigest()
+
+
+def is_appended(path, offset, checksum):
+    """True when the first ``offset`` bytes of ``path`` still have the prefix ``checksum``."""
+    return checksum is not None and prefix_checksum(path, offset) == checksum
+
+
+def _hash_file(path, size, block_size=1 << 20):
+    # I will resume from the hash of the previous size when the file was only appended to
+    sha, start = hashlib.sha256(), 0
+    state = _hash_states.get(path)
+    if state is not None and state[0] <= size and is_appended(path, state[0], state[2]):
+        start, sha = state[0], state[1].copy()
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = size - start
+        while remaining > 0:
+            block = handle.read(min(block_size, remaining))
+            if not block:
+                break
+            sha.update(block)
+            remaining -= len(block)
+    _hash_states[path] = (size, sha.copy(), prefix_checksum(path, size))
+    return sha.hexdigest()
+
+
+def file_fingerprint(path=DATA_PATH):
+    """Return the Fingerprint of ``path``; cheap (a stat) when the file did not change."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _digests.get(key)
+    if digest is None:
+        digest = _hash_file(path, stat.st_size)
+        _digests[key] = digest
+    return Fingerprint(path, stat.st_size, stat.st_mtime_ns, digest)
+
+
+# Bumped whenever clean_breaches(), profile_raw() or the entity resolution change their output, so old
+# snapshots are never reused
+SNAPSHOT_VERSION = 6
+
+
+def read_breaches(path=DATA_PATH, nrows=None):
+    """Read the raw CSV exactly as published on Kaggle."""
+    return pd.read_csv(path, nrows=nrows)
+
+
+def read_appended(path, offset, checksum, size):
+    """Parse the rows appended to the CSV between byte ``offset`` and ``size``.
+
+    Returns ``(raw rows, new offset)``, or None when the first ``offset`` bytes
+    no longer match ``checksum`` (or do not end a line), i.e. the file has to be
+    read in full. Only complete lines are parsed: a last line still being
+    written stays in the file for the next call.
+    """
+    if offset <= 0 or not is_appended(path, offset, checksum):
+        return None
+    with open(path, 'rb') as handle:
+        columns = pd.read_csv(handle, nrows=0).columns
+        handle.seek(offset - 1)
+        data = handle.read(size - offset + 1)
+    if not data.startswith(b'\n'):
+        return None
+    data = data[1:]
+    end = data.rfind(b'\n') + 1
+    if not data[:end].strip():
+        return pd.DataFrame(columns=columns), offset + end
+    return pd.read_csv(io.BytesIO(data[:end]), header=None, names=columns), offset + end
+
+
+# I will create a function that will capitalize each word in a string
+def capitalize_each_word(s):
+    return ' '.join(word.capitalize() for word in s.split())
+
+
+def _relabel(raw, labels):
+    # I will give every category of ``raw`` its new label and map the rows over through
+    # the categorical codes. Several old categories ('hacked', 'HACKED') can end up on
+    # the same label, so the categories are rebuilt from the unique (sorted) labels.
+    categories, inverse = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+    codes = np.asarray(raw.codes)
+    if len(categories):
+        codes = np.where(codes >= 0, inverse[codes], -1)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def clean_breaches(raw):
+    """Return the cleaned copy of the raw frame used by every chart of the data story.
+
+    'Year' is stored as int16, 'Records' as float32 in millions and the text
+    columns as categories, with 'Entity_short' derived from the 'Entity' ones.
+    """
+    # I will convert Year to integer, invalid years (e.g. '2014 and 2015') become NA and are dropped
+    year = pd.to_numeric(raw['Year'], errors='coerce')
+    valid = year.notna().to_numpy()
+    data_breaches = raw.loc[valid, ['Entity', 'Year', 'Records', 'Organization type', 'Method']]
+    data_breaches = data_breaches.reset_index(drop=True)
+    data_breaches['Year'] = year[valid].to_numpy().astype(np.int16)
+
+    # Ensure 'Records' column is numeric and convert it to millions (the unit of every chart)
+    records = pd.to_numeric(data_breaches['Records'], errors='coerce')
+    data_breaches['Records'] = (records / 1e6).astype(np.float32)
+
+    # I will standardize 'Organization type' and 'Method' ('hacked' and 'HACKED' are the same)
+    # by capitalizing each word, once per distinct value instead of once per row
+    for col in ['Organization type', 'Method']:
+        raw_values = pd.Categorical(data_breaches[col])
+        labels = [capitalize_each_word(str(v)) for v in raw_values.categories]
+        codes = np.asarray(raw_values.codes)
+        if (codes < 0).any():
+            # A missing value reads 'Nan' (str(nan) capitalized, as in the original notebook), so its
+            # rows stay in the cube, the totals and Graph 1 instead of being dropped by the groupby
+            codes = np.where(codes >= 0, codes, len(labels))
+            labels.append('Nan')
+        data_breaches[col] = _relabel(pd.Categorical.from_codes(codes, categories=range(len(labels))), labels)
+
+    # Entity names are kept as they are; the short labels (first three words, for readable
+    # axis labels) are derived with vectorized string operations on the distinct names
+    entity = pd.Categorical(data_breaches['Entity'])
+    data_breaches['Entity'] = entity
+    data_breaches['Entity_short'] = _relabel(entity,
+                                             entity.categories.str.split().str[:3].str.join(' '))
+
+    return data_breaches
+
+
+def profile_raw(raw):
+    """Summarize the raw frame for the Data Cleaning expander (JSON serializable)."""
+    return {
+        'missing_values': {col: int(n) for col, n in raw.isnull().sum().items()},
+        'records_summary': {stat: float(v) for stat, v in raw['Records'].describe().items()},
+        # The mergeable version of the summary, for the profiles of shards and appended rows
+        'records_sketch': QuantileSketch.of(pd.to_numeric(raw['Records'], errors='coerce')).to_dict(),
+        'data_types': {col: str(dtype) for col, dtype in raw.dtypes.items()},
+        # A full hash pass over the rows, done once per snapshot instead of once per rerun
+        'duplicates': int(raw.duplicated().sum()),
+    }
+
+
+def snapshot_paths(path=DATA_PATH):
+    """Return the (cleaned Parquet frame, raw JSON profile) paths of the snapshot of ``path``."""
+    base = os.path.splitext(os.path.abspath(path))[0]
+    return ('%s.clean-v%d.parquet' % (base, SNAPSHOT_VERSION),
+            '%s.profile-v%d.json' % (base, SNAPSHOT_VERSION))
+
+
+def _fresh_profile(path):
+    # The raw profile of the snapshot of ``path``, None when the snapshot is missing or stale
+    try:
+        source_mtime = os.stat(path).st_mtime_ns
+        if any(os.stat(p).st_mtime_ns < source_mtime for p in snapshot_paths(path)):
+            return None
+        with open(snapshot_paths(path)[1]) as handle:
+            profile = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    # The mtime alone misses a CSV replaced by an older copy; the hash of an unchanged file is cached
+    return profile if profile.get('source_digest') == file_fingerprint(path).digest else None
+
+
+def snapshot_is_fresh(path=DATA_PATH):
+    """True when both snapshot files exist, are not older than the CSV and were built from its content."""
+    return _fresh_profile(path) is not None
+
+
+def _write_atomic(target, write, mtime_ns):
+    # Write next to the target and rename, so a concurrent reader never sees half a file
+    tmp = '%s.%d.tmp' % (target, os.getpid())
+    try:
+        write(tmp)
+        # The snapshot carries the mtime of the CSV it was built from: if the CSV changes
+        # while I am building, the snapshot is immediately older than it, hence stale
+        os.utime(tmp, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def build_snapshot(path=DATA_PATH, resolve=True):
+    """Clean the CSV, resolve its entities (unless ``resolve`` is False), write its snapshot and
+    return ``(cleaned frame, raw profile)``."""
+    # Imported here, entities imports this module
+    from breaches.entities import EntityResolver
+
+    source = file_fingerprint(path)
+    raw = read_breaches(path)
+    cleaned = clean_breaches(raw)
+    if resolve:
+        # The canonical entities are resolved once here and stored with the cleaned columns, so a
+        # cold start reads them instead of comparing the names again (the entities of a shard are
+        # resolved over all the shards instead, see ``shards``)
+        cleaned = EntityResolver().resolve(cleaned)
+    profile = profile_raw(raw)
+    # If the CSV changes while I am reading it, its mtime makes the snapshot stale
+    profile['source_digest'] = source.digest
+
+    frame_path, profile_path = snapshot_paths(path)
+
+    def write_profile(tmp):
+        with open(tmp, 'w') as handle:
+            json.dump(profile, handle)
+
+    try:
+        _write_atomic(frame_path, lambda tmp: cleaned.to_parquet(tmp, index=False), source.mtime_ns)
+        _write_atomic(profile_path, write_profile, source.mtime_ns)
+    except (OSError, ImportError):
+        # Read-only deployment or no Parquet engine: the app keeps working from memory
+        pass
+    return cleaned, profile
+
+
+def load_snapshot(path=DATA_PATH, resolve=True):
+    """Return ``(cleaned frame, raw profile)`` from the snapshot, rebuilding it when stale.
+
+    With ``resolve`` False the frame comes without the canonical entity columns."""
+    from breaches.entities import ENTITY_COLUMNS, EntityResolver
+
+    profile = _fresh_profile(path)
+    if profile is not None:
+        try:
+            frame = pd.read_parquet(snapshot_paths(path)[0])
+        except (OSError, ValueError, ImportError):
+            frame = None
+        if frame is not None:
+            if not resolve:
+                return frame.drop(columns=ENTITY_COLUMNS, errors='ignore'), profile
+            if 'Entity_canonical' not in frame:
+                # The snapshot of a shard, stored before its entities were resolved
+                frame = EntityResolver().resolve(frame)
+            return frame, profile
+    return build_snapshot(path, resolve)
+
+
+if __name__ == '__main__':
+    # Build step, e.g. in the container image: python -m breaches.dataset data_breaches.csv
+    # (a directory or glob of shards builds the snapshot of every shard)
+    parser = argparse.ArgumentParser(description='Build the cleaned snapshot of a breach CSV.')
+    parser.add_argument('paths', nargs='*', default=[DATA_PATH])
+    parser.add_argument('--force', action='store_true', help='rebuild even when the snapshot is fresh')
+    args = parser.parse_args()
+    from breaches.shards import is_sharded, shard_paths
+    for csv_path, sharded in [(shard, is_sharded(path)) for path in args.paths for shard in shard_paths(path)]:
+        if args.force or not snapshot_is_fresh(csv_path):
+            # The entities of shards are resolved over all of them when they are loaded
+            build_snapshot(csv_path, resolve=not sharded)
+            print('built', *snapshot_paths(csv_path))
+        else:
+            print('fresh', *snapshot_paths(csv_path))
@@ -0,0 +1,34 @@
+"""
+Diagnostics shown in the Data Cleaning and Data Preparation expanders.
+
+Everything the two expanders display is derived here from the dataset of one
+version: the raw profile (computed once when the dataset was loaded, together
+with its duplicate count) and a few cleaned rows. The row sample is seeded by
+the dataset version, so it is the same on every rerun and the whole result can
+be cached per version.
+"""
+
+import pandas as pd
+
+# The columns of the sample in the Data Preparation expander
+SAMPLE_COLUMNS = ['Organization type', 'Method']
+
+
+def version_seed(version):
+    """A random seed derived from a dataset version (a hex digest), 0 without a version."""
+    return int(version[:8], 16) if version else 0
+
+
+def dataset_diagnostics(dataset, sample_rows=5):
+    """Return the tables of the two expanders for ``dataset`` as a dict of small frames."""
+    profile = dataset.profile
+    duplicates = profile.get('duplicates')
+    return {
+        'missing_values': pd.Series(profile['missing_values'], name='Missing', dtype='int64'),
+        'records_summary': pd.Series(profile['records_summary'], name='Records', dtype='float64'),
+        'raw_types': pd.DataFrame(pd.Series(profile['data_types'], dtype=object), columns=['Type']),
+        # None when the rows were never all in memory at once (streamed, merged or appended data)
+        'duplicates': None if duplicates is None else int(duplicates),
+        'cleaned_types': pd.DataFrame(dataset.dtypes.astype(str), columns=['Data Type']),
+        'sample': dataset.sample(sample_rows, SAMPLE_COLUMNS, random_state=version_seed(dataset.version)),
+    }
@@ -0,0 +1,88 @@
+"""
+Mergeable distinct counts of the breached entities (HyperLogLog sketches).
+
+Counting the distinct entities of a selection exactly needs the entity of every
+row of it. A HyperLogLog sketch instead hashes every entity name to 64 bits,
+uses the first ``PRECISION`` bits to pick one of ``2 ** PRECISION`` registers
+and keeps in that register the longest run of leading zero bits seen in the
+rest. The registers of the union of two parts of the data are the maximum of
+their registers, so the sketches of the cube cells of any selection merge into
+the sketch of the selection.
+
+A sketch is ``2 ** PRECISION`` bytes (4 KB) whatever the number of rows, and its
+count is off by about 1.6% (``1.04 / sqrt(2 ** PRECISION)``); small counts are
+estimated from the empty registers instead (linear counting), which is close to
+exact for the few hundred entities of a year.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Bits of the hash that pick the register
+PRECISION = 12
+
+# Bits left for the run of leading zeros
+_RANK_BITS = 64 - PRECISION
+
+
+def entity_hashes(entities):
+    """64 bit hashes of the ``entities`` (a categorical Series), 0 for a missing entity.
+
+    Only the categories are hashed, so the hash of a name does not depend on the chunk or
+    the dataset version it comes from.
+    """
+    entities = entities.astype('category').cat
+    hashes = pd.util.hash_array(np.asarray(entities.categories, dtype=object), categorize=False)
+    codes = np.asarray(entities.codes)
+    return np.where(codes >= 0, hashes[codes] if len(hashes) else 0, 0).astype(np.uint64)
+
+
+def _registers_and_ranks(hashes):
+    # The first PRECISION bits pick the register, the rank is 1 + the leading zeros of the rest
+    index = (hashes >> np.uint64(_RANK_BITS)).astype(np.int64)
+    rest = hashes & np.uint64((1 << _RANK_BITS) - 1)
+    # The bit length of the rest, exact in float64 once the low bits are shifted out
+    high = (rest >> np.uint64(11)).astype(np.float64)
+    bits = np.where(high > 0, np.frexp(high)[1] + 11, np.frexp(rest.astype(np.float64))[1])
+    return index, (_RANK_BITS - bits + 1).astype(np.uint8)
+
+
+class DistinctSketch:
+    """HyperLogLog sketch of the distinct entities of a part of the data."""
+
+    def __init__(self, registers=None):
+        self.registers = np.zeros(1 << PRECISION, dtype=np.uint8) if registers is None else registers
+
+    @classmethod
+    def grouped(cls, hashes, groups, n_groups):
+        """One sketch per group ``0 .. n_groups - 1`` of the ``hashes`` (rows of group -1 and
+        missing entities are left out)."""
+        keep = (groups >= 0) & (hashes != 0)
+        index, ranks = _registers_and_ranks(hashes[keep])
+        registers = np.zeros((n_groups, 1 << PRECISION), dtype=np.uint8)
+        np.maximum.at(registers, (groups[keep], index), ranks)
+        return [cls(row) for row in registers]
+
+    @classmethod
+    def merged(cls, sketches):
+        """A new sketch of the union of ``sketches``, which are left as they are."""
+        registers = [sketch.registers for sketch in sketches]
+        return cls(np.maximum.reduce(registers) if registers else None)
+
+    def count(self):
+        """The estimated number of distinct entities."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty:
+            # Linear counting from the empty registers is more accurate for small counts
+            return m * np.log(m / empty)
+        return estimate
+
+    def to_bytes(self):
+        return self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(np.frombuffer(data, dtype=np.uint8))
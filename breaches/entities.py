@@ -0,0 +1,329 @@
+"""
+Entity resolution: one canonical name and id per organization.
+
+The same organization appears under several spellings ("Citigroup" and
+"Citigroup Inc.", "Marriott International" and "Marriot International"),
+which splits its breaches over several entities in Graphs 2 and 3. The
+resolver gives every distinct 'Entity' name an entity:
+
+* names with the same key (lowercase, punctuation and legal suffixes such as
+  "Inc." or "Ltd" removed) are the same entity;
+* two keys are similar when they have the same numbers ("Global Health 1" and
+  "Global Health 2" are two organizations) and their character trigrams
+  overlap by at least ``SIMILARITY``; a key is only compared with the keys
+  that share a blocking key with it (the first letters of one of its words, or
+  of two adjacent words);
+* an entity is a connected group of similar keys.
+
+Blocks are capped in size, so a key is compared with a bounded number of keys
+and resolving a dataset stays linear in its distinct names instead of
+comparing all pairs. A blocking key shared by more keys than the cap (a very
+common word) is not used for comparisons.
+
+The entities only depend on the set of names, not on the order they come in:
+the canonical name of an entity is its most frequent spelling (the first one
+alphabetically among equally frequent ones), its id a hash of its smallest key
+and its short label the first three words of the canonical name, or the whole
+name when another entity starts with the same three words. Adding names
+(a chunk, a shard, appended rows) resolves the entities of the blocks they
+touch again under the same rules, so an appended dataset gets the entities of
+a full reload of the same rows.
+
+The raw 'Entity' and 'Entity_short' columns are kept as they are; ``resolve``
+adds 'Entity_canonical', 'Entity_canonical_short' and 'Entity_id'.
+"""
+
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from breaches.dataset import _relabel
+from breaches.entity_search import normalize
+
+# Words that do not tell organizations apart
+LEGAL_SUFFIXES = frozenset(['co', 'company', 'corp', 'corporation', 'inc', 'incorporated', 'limited',
+                            'llc', 'ltd', 'plc', 'the'])
+
+# Trigram overlap (Jaccard) from which two keys are the same entity
+SIMILARITY = 0.85
+
+# Keys a blocking key holds at most; the key of a word this common is not used for comparisons
+MAX_BLOCK = 32
+
+# Letters of a word that make its blocking key
+BLOCK_PREFIX = 4
+
+# Words with a digit, which have to be equal in two similar keys
+_NUMBER_WORD = re.compile(r'\S*\d\S*')
+
+# Columns resolve() adds to a cleaned frame
+ENTITY_COLUMNS = ['Entity_canonical', 'Entity_canonical_short', 'Entity_id']
+
+
+def entity_key(name):
+    """The normalized name without its legal suffixes ("Citigroup Inc." -> "citigroup")."""
+    words = normalize(name).split()
+    return ' '.join(word for word in words if word not in LEGAL_SUFFIXES) or ' '.join(words)
+
+
+def entity_keys(entities):
+    """The entity keys of ``entities`` (a Series of names), computed once per distinct name."""
+    names = entities.astype('category').cat
+    keys = pd.Categorical.from_codes(names.codes, categories=range(len(names.categories)))
+    return pd.Series(_relabel(keys, [entity_key(name) for name in names.categories]), index=entities.index)
+
+
+def blocking_keys(key):
+    """The first letters of every word of ``key`` and of every two adjacent words; the
+    pairs still find the similar names of a word too common to be a block of its own."""
+    prefixes = [word[:BLOCK_PREFIX] for word in key.split()]
+    return set(prefixes) | {' '.join(pair) for pair in zip(prefixes, prefixes[1:])}
+
+
+def _numbers(key):
+    return _NUMBER_WORD.findall(key)
+
+
+def _trigrams(key):
+    padded = ' %s ' % key
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _entity_ids(roots):
+    # Non-negative int64 hashes of the smallest keys of the entities, the same in every load
+    return (pd.util.hash_array(np.asarray(roots, dtype=object), categorize=False) >> np.uint64(1))\
+        .astype(np.int64)
+
+
+def _short_prefix(name):
+    return ' '.join(name.split()[:3])
+
+
+class EntityResolver:
+    """Mapping of entity names to canonical names, short labels and entity ids."""
+
+    def __init__(self, similarity=SIMILARITY, max_block=MAX_BLOCK):
+        self.similarity = similarity
+        self.max_block = max_block
+        # Rows and key of every name, and the names of every key
+        self._counts = {}
+        self._key_of = {}
+        self._names = {}
+        # Blocking key -> keys; a block of more than max_block keys is not compared
+        self._blocks = defaultdict(list)
+        self._grams = {}
+        # Entity of every key (its smallest key), the keys of every entity and its labels
+        self._entity = {}
+        self._members = {}
+        self._labels = {}
+        # Entities per first three words of their canonical name, which decide the short labels
+        self._by_prefix = defaultdict(set)
+
+    def __len__(self):
+        return len(self._members)
+
+    @classmethod
+    def from_frame(cls, frame, similarity=SIMILARITY, max_block=MAX_BLOCK):
+        """The resolver of a frame resolved before (e.g. read from a snapshot), without
+        comparing any names again."""
+        resolver = cls(similarity, max_block)
+        entity = frame['Entity'].astype('category').cat
+        codes = np.asarray(entity.codes)
+        present = codes >= 0
+        counts = np.bincount(codes[present], minlength=len(entity.categories))
+        # The labels of every name, from one of its rows
+        row = np.full(len(entity.categories), -1)
+        row[codes[present]] = np.flatnonzero(present)
+        labels = frame.iloc[row[row >= 0]][ENTITY_COLUMNS].itertuples(index=False)
+        keys_of_entity, labels_of_entity = defaultdict(list), {}
+        names = entity.categories[row >= 0]
+        for name, count, (canonical, short, entity_id) in zip(names, counts[row >= 0], labels):
+            key = entity_key(name)
+            resolver._counts[name] = int(count)
+            resolver._key_of[name] = key
+            if key not in resolver._names:
+                resolver._names[key] = []
+                resolver._register(key)
+                keys_of_entity[entity_id].append(key)
+            resolver._names[key].append(name)
+            labels_of_entity[entity_id] = (canonical, short, int(entity_id))
+        for entity_id, keys in keys_of_entity.items():
+            root = min(keys)
+            resolver._members[root] = sorted(keys)
+            resolver._labels[root] = labels_of_entity[entity_id]
+            resolver._by_prefix[_short_prefix(labels_of_entity[entity_id][0])].add(root)
+            for key in keys:
+                resolver._entity[key] = root
+        return resolver
+
+    def _register(self, key):
+        # I will add a new key to its blocks and return the keys of the blocks it fills up
+        full = []
+        for block in blocking_keys(key):
+            keys = self._blocks[block]
+            keys.append(key)
+            if len(keys) == self.max_block + 1:
+                # The keys of the block lose the similar keys they only found through it
+                full.extend(keys[:-1])
+        return full
+
+    def _trigrams(self, key):
+        grams = self._grams.get(key)
+        if grams is None:
+            grams = self._grams[key] = _trigrams(key)
+        return grams
+
+    def _similar_keys(self, key, within=None):
+        # The keys similar to ``key`` among those sharing a block with it (and ``within``)
+        grams, numbers = self._trigrams(key), _numbers(key)
+        seen, similar = {key}, []
+        for block in blocking_keys(key):
+            keys = self._blocks[block]
+            if len(keys) > self.max_block:
+                continue
+            for other in keys:
+                if other in seen or (within is not None and other not in within):
+                    continue
+                seen.add(other)
+                other_grams = self._trigrams(other)
+                # Jaccard similarity, skipped when the sizes alone rule it out
+                if min(len(grams), len(other_grams)) < self.similarity * max(len(grams), len(other_grams)):
+                    continue
+                if (len(grams & other_grams) >= self.similarity * len(grams | other_grams)
+                        and _numbers(other) == numbers):
+                    similar.append(other)
+        return similar
+
+    def add(self, names, counts=None):
+        """Add ``counts`` rows (1 each by default) of ``names`` and resolve the entities they
+        touch. Returns the names added before whose labels changed."""
+        counts = np.ones(len(names), dtype=np.int64) if counts is None else np.asarray(counts)
+        new_names, new_keys, counted, full = set(), [], set(), []
+        for name, count in zip(names, counts):
+            if count <= 0:
+                continue
+            key = self._key_of.get(name)
+            if key is None:
+                key = self._key_of[name] = entity_key(name)
+                new_names.add(name)
+                if key not in self._names:
+                    self._names[key] = []
+                    new_keys.append(key)
+                    full.extend(self._register(key))
+                self._names[key].append(name)
+            self._counts[name] = self._counts.get(name, 0) + int(count)
+            counted.add(key)
+
+        # I will group again every entity a new key is similar to, or that lost a full block
+        edges = [(key, other) for key in new_keys for other in self._similar_keys(key)]
+        regroup = set(new_keys)
+        for key in full + [other for _, other in edges]:
+            if key in self._entity:
+                regroup.update(self._members[self._entity[key]])
+        old_roots = {self._entity[key] for key in regroup | counted if key in self._entity}
+        before = {key: self._labels[root] for root in old_roots for key in self._members[root]}
+
+        # Connected groups of similar keys (union-find); the edges between two regrouped old keys
+        # are found again, the edges of the new keys are known
+        parent = {key: key for key in regroup}
+
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        old = regroup.difference(new_keys)
+        edges.extend((key, other) for key in old for other in self._similar_keys(key, old) if other < key)
+        for key, other in edges:
+            parent[find(key)] = find(other)
+        groups = defaultdict(list)
+        for key in regroup:
+            groups[find(key)].append(key)
+
+        prefixes = set()
+        for root in old_roots:
+            prefix = _short_prefix(self._labels[root][0])
+            self._by_prefix[prefix].discard(root)
+            prefixes.add(prefix)
+            if all(key in regroup for key in self._members[root]):
+                del self._members[root]
+                del self._labels[root]
+        roots = {root for root in old_roots if root in self._members}
+        for keys in groups.values():
+            root = min(keys)
+            self._members[root] = sorted(keys)
+            for key in keys:
+                self._entity[key] = root
+            roots.add(root)
+
+        # Canonical names and ids of the entities with new keys or new rows, then the short labels
+        # of every entity that shares the first three words with one of them
+        roots = sorted(roots)
+        for root, entity_id in zip(roots, _entity_ids(roots)):
+            names = [name for key in self._members[root] for name in self._names[key]]
+            canonical = min(names, key=lambda name: (-self._counts[name], name))
+            self._labels[root] = (canonical, None, int(entity_id))
+            prefixes.add(_short_prefix(canonical))
+            self._by_prefix[_short_prefix(canonical)].add(root)
+        for prefix in prefixes:
+            for root in self._by_prefix[prefix]:
+                for key in self._members[root]:
+                    before.setdefault(key, self._labels[root])
+                canonical, _, entity_id = self._labels[root]
+                short = prefix if len(self._by_prefix[prefix]) == 1 else canonical
+                self._labels[root] = (canonical, short, entity_id)
+        return {name for key, labels in before.items() if self._labels[self._entity[key]] != labels
+                for name in self._names[key] if name not in new_names}
+
+    def add_entities(self, entities):
+        """Add the rows of an 'Entity' column; returns the names added before whose labels changed."""
+        entities = entities.astype('category').cat
+        codes = np.asarray(entities.codes)
+        return self.add(entities.categories, np.bincount(codes[codes >= 0], minlength=len(entities.categories)))
+
+    def labels(self, name):
+        """The (canonical name, short label, entity id) of a name added before."""
+        return self._labels[self._entity[self._key_of[name]]]
+
+    def table(self):
+        """One row per name added: its 'Entity' and the ENTITY_COLUMNS it resolves to."""
+        names = sorted(self._key_of)
+        canonical, short, ids = zip(*map(self.labels, names)) if names else ((), (), ())
+        return pd.DataFrame({'Entity': names, 'Entity_canonical': list(canonical),
+                             'Entity_canonical_short': list(short), 'Entity_id': np.asarray(ids, dtype=np.int64)})
+
+    def resolve(self, frame, add=True):
+        """Return ``frame`` with the 'Entity_canonical', 'Entity_canonical_short' and 'Entity_id'
+        of its 'Entity' names (added to the resolver first, unless ``add`` is False)."""
+        if add:
+            self.add_entities(frame['Entity'])
+        names = frame['Entity'].astype('category').cat.categories
+        # Categories without rows were never added, they resolve to themselves
+        return _with_labels(frame, [self.labels(name) if name in self._key_of else (name, name, -1)
+                                    for name in names])
+
+
+def apply_entities(frame, table):
+    """Return ``frame`` with the ENTITY_COLUMNS of its 'Entity' names looked up in ``table``
+    (``EntityResolver.table``); names missing from it resolve to themselves."""
+    names = frame['Entity'].astype('category').cat.categories
+    positions = pd.Index(table['Entity']).get_indexer(names)
+    rows = list(table[ENTITY_COLUMNS].itertuples(index=False, name=None))
+    return _with_labels(frame, [rows[p] if p >= 0 else (name, name, -1) for name, p in zip(names, positions)])
+
+
+def _with_labels(frame, labels):
+    # I will map the rows to the (canonical name, short label, entity id) of their 'Entity'
+    # category through the codes, so every label is looked up once per name
+    codes = np.asarray(frame['Entity'].astype('category').cat.codes)
+    canonical, short, ids = zip(*labels) if labels else ((), (), ())
+    raw = pd.Categorical.from_codes(codes, categories=range(len(labels)))
+    resolved = frame.copy(deep=False)
+    resolved['Entity_canonical'] = _relabel(raw, canonical)
+    resolved['Entity_canonical_short'] = _relabel(raw, short)
+    ids = np.asarray(ids, dtype=np.int64)
+    resolved['Entity_id'] = np.where(codes >= 0, ids[codes] if len(ids) else -1, -1)
+    return resolved
@@ -0,0 +1,143 @@
+"""
+Prefix index of the entity names for the sidebar search.
+
+The names are normalized once (lowercase, punctuation as spaces) and kept in
+two sorted arrays: the whole normalized names, and every word of every name
+with the names it occurs in. Names that start with the query are found with
+``bisect`` and come first. Then come the names that have a word starting with
+every word of the query ("marriott" finds "Marriott International", "int marr"
+finds it too).
+
+Every query word has a sorted list of the names that contain a word starting
+with it. For a word of the query that is a whole word of the index, or a prefix
+of few words, that is a slice of the postings. For the one or two letter
+prefixes the lists are precomputed, because those prefixes start too many
+words to merge per query. The lists of the query words are intersected
+rarest first, in growing blocks of the rarest list, and the search stops once
+``limit`` names are found. A lookup never looks at the name strings again, and
+common words stop after the first block.
+"""
+
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+_NOT_ALPHANUMERIC = re.compile(r'[\W_]+')
+
+# Sorts behind every string that starts with the same prefix
+_PREFIX_END = '\U0010ffff'
+
+# Letters of the word prefixes whose name lists are precomputed
+SHORT_PREFIX = 2
+
+
+def normalize(name):
+    """Lowercase ``name`` and turn every run of punctuation and spaces into one space."""
+    return _NOT_ALPHANUMERIC.sub(' ', str(name).lower()).strip()
+
+
+def _prefix_range(keys, prefix):
+    return bisect_left(keys, prefix), bisect_left(keys, prefix + _PREFIX_END)
+
+
+def _sorted_union(postings):
+    # The distinct ids of several sorted posting lists, sorted: a stable sort of the concatenated
+    # runs is close to a merge, and the duplicates are next to each other afterwards
+    ids = np.sort(postings, kind='stable')
+    if len(ids):
+        ids = ids[np.concatenate([[True], ids[1:] != ids[:-1]])]
+    return ids
+
+
+def _grouped_postings(group_codes, ids, n_groups):
+    # The distinct ids of every group, sorted, as one array and the offsets of the groups in it
+    order = np.lexsort((ids, group_codes))
+    group_codes, ids = group_codes[order], ids[order]
+    first = np.ones(len(ids), dtype=bool)
+    first[1:] = (group_codes[1:] != group_codes[:-1]) | (ids[1:] != ids[:-1])
+    group_codes, ids = group_codes[first], ids[first]
+    return ids, np.searchsorted(group_codes, np.arange(n_groups + 1))
+
+
+class EntityIndex:
+    """Sorted normalized names and words of the entity names, searched by prefix."""
+
+    def __init__(self, names, keys, words, offsets, postings, short_prefixes):
+        # The names sorted by their normalized key, the position of a name is its id
+        self.names = names
+        self.keys = keys
+        # Distinct words, sorted, and the ids of the names of word i in postings[offsets[i]:offsets[i + 1]]
+        self.words = words
+        self.offsets = offsets
+        self.postings = postings
+        # Prefix of up to SHORT_PREFIX letters -> sorted ids of the names with a word starting with it
+        self.short_prefixes = short_prefixes
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, names):
+        # I will normalize and sort the distinct names with vectorized string operations
+        names = pd.Series(pd.unique(pd.Series(list(names), dtype=object).dropna().astype(str)), dtype=object)
+        keys = names.str.lower().str.replace(_NOT_ALPHANUMERIC, ' ', regex=True).str.strip()
+        # (a fixed width unicode array sorts much faster than an object array of strings)
+        order = np.argsort(keys.to_numpy(dtype=str), kind='stable')
+        names, keys = names.iloc[order].tolist(), keys.iloc[order].reset_index(drop=True)
+
+        # The (word, name id) pairs sorted by word and then by id, so the names of a word are one
+        # sorted slice of the postings; only the distinct words are sorted as strings
+        pairs = keys.str.split().explode().dropna()
+        word_codes, words = pd.factorize(pairs, sort=True)
+        ids = pairs.index.to_numpy(dtype=np.int32)
+        postings, offsets = _grouped_postings(word_codes, ids, len(words))
+
+        # The same for the first letters of the words, whose lists would be too long to merge per query
+        short_prefixes = {}
+        for length in range(1, SHORT_PREFIX + 1):
+            prefix_codes, prefixes = pd.factorize(words.str[:length], sort=True)
+            prefix_postings, prefix_offsets = _grouped_postings(prefix_codes[word_codes], ids, len(prefixes))
+            short_prefixes.update((prefix, prefix_postings[prefix_offsets[i]:prefix_offsets[i + 1]])
+                                  for i, prefix in enumerate(prefixes))
+        return cls(names, keys.tolist(), list(words), offsets, postings, short_prefixes)
+
+    def _word_postings(self, word):
+        # Sorted ids of the names with a word that starts with ``word``
+        if len(word) <= SHORT_PREFIX:
+            return self.short_prefixes.get(word, self.postings[:0])
+        lo, hi = _prefix_range(self.words, word)
+        if hi - lo == 1:
+            return self.postings[self.offsets[lo]:self.offsets[hi]]
+        # A longer prefix starts a few words ("health" and "healthcare"), their lists are merged
+        return _sorted_union(self.postings[self.offsets[lo]:self.offsets[hi]])
+
+    def search(self, query, limit=20):
+        """Up to ``limit`` entity names matching ``query``, names starting with it first."""
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        # The names that start with the query are one range of the sorted keys
+        lo, hi = _prefix_range(self.keys, query)
+        found = list(range(lo, min(hi, lo + limit)))
+        if len(found) < limit:
+            # Otherwise every word of the query has to start a word of the name: I will intersect
+            # the sorted name lists of the query words, rarest first, one block of the rarest list
+            # at a time, and stop as soon as enough names are found
+            lists = sorted((self._word_postings(word) for word in set(query.split())), key=len)
+            rarest, others = lists[0], lists[1:]
+            start, block = 0, 4 * limit
+            while start < len(rarest) and len(found) < limit:
+                ids = rarest[start:start + block]
+                for other in others:
+                    positions = np.minimum(np.searchsorted(other, ids), len(other) - 1)
+                    ids = ids[other[positions] == ids] if len(other) else ids[:0]
+                    if not len(ids):
+                        break
+                # The names of the prefix range are in ``found`` already
+                ids = ids[(ids < lo) | (ids >= hi)]
+                found.extend(ids[:limit - len(found)].tolist())
+                start, block = start + block, 2 * block
+        return [self.names[i] for i in found]
@@ -0,0 +1,52 @@
+"""
+Sorted pages of the filtered breach rows for the data explorer.
+
+Only the rows of the visible page are ever copied out of the dataset, and only
+the rows up to the end of the page are sorted: a partition of the sort keys of
+the selection finds the key the page ends at, and just the rows with keys up to
+it are sorted. A page turn then costs one pass over the selected rows and a sort
+of a page's worth of rows, and nothing is kept between page turns.
+"""
+
+import numpy as np
+import pandas as pd
+
+# The columns of the explorer, in the order they are shown and offered as sort keys
+EXPLORER_COLUMNS = ['Entity', 'Year', 'Records', 'Organization type', 'Method']
+
+
+def sort_key(values):
+    """A numeric key of ``values`` that sorts like the values (categories alphabetically).
+
+    Missing values get NaN, so they are sorted behind every value in both directions.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # The categories of an appended dataset are not sorted, so I rank them first
+        categories = values.cat.categories
+        rank = np.empty(len(categories), dtype=np.float64)
+        rank[categories.argsort()] = np.arange(len(categories))
+        codes = np.asarray(values.cat.codes)
+        return np.where(codes >= 0, rank[codes], np.nan)
+    return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _smallest(key, n):
+    # Indices of the n smallest keys in sorted order, ties in index order and NaN last
+    if n < len(key):
+        kth = np.partition(key, n - 1)[n - 1]
+        if not np.isnan(kth):
+            # Every key up to the n-th smallest, so the ties at the end of the page keep their order
+            candidates = np.flatnonzero(key <= kth)
+            return candidates[np.argsort(key[candidates], kind='stable')][:n]
+    # A stable argsort puts NaN last
+    return np.argsort(key, kind='stable')[:n]
+
+
+def page_positions(values, mask, start, size, ascending=True):
+    """The positions of rows ``start:start + size`` of the rows in ``mask`` (None for all) sorted
+    by ``values`` (ties in row order, missing values last), and the number of rows in ``mask``."""
+    positions = np.arange(len(values)) if mask is None else np.flatnonzero(mask)
+    key = sort_key(values if mask is None else values.take(positions))
+    # Negating the key sorts descending with the same ties
+    ranked = _smallest(key if ascending else -key, min(start + size, len(key)))
+    return positions[ranked[start:]], len(positions)
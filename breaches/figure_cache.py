@@ -0,0 +1,57 @@
+"""
+Process-wide LRU cache of the built Plotly figures.
+
+A figure is keyed by the graph, the dataset version and the canonical filter
+selection (plus the graph's own settings such as K), and stored serialized
+as JSON. A hit skips both the aggregation and the Plotly construction; the
+least recently used figure is evicted once the cache is full.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+
+def canonical_selection(selection):
+    """Hashable, order independent form of a filter selection (None stays "All ...")."""
+    return tuple((column, None if values is None else tuple(sorted(values)))
+                 for column, values in sorted(selection.items()))
+
+
+class FigureCache:
+    """Bounded LRU mapping of figure keys to serialized figures, safe across sessions."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._figures)
+
+    def get_or_build(self, key, build):
+        """Return the cached figure of ``key``, or build, store and return it."""
+        with self._lock:
+            payload = self._figures.get(key)
+            if payload is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+        if payload is not None:
+            # The payload comes from a figure that was validated when it was built, so I skip
+            # Plotly's validation on the way back (several times faster than pio.from_json);
+            # Plotly is imported here, not with this module, to keep it off the cold start path
+            import plotly.graph_objects as go
+            return go.Figure(json.loads(payload), _validate=False)
+
+        # Built outside the lock, two sessions missing the same key at once both build it
+        figure = build()
+        payload = figure.to_json()
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = payload
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return figure
@@ -0,0 +1,113 @@
+"""
+Precomputed filter index for the sidebar multiselects.
+
+For every distinct value of 'Year', 'Organization type' and 'Method' the index
+keeps a packed bitmask of the rows holding that value (one bit per row). A
+sidebar selection is then a bitwise OR of the cached masks within a column and
+a bitwise AND across columns, instead of three ``isin`` scans over the rows.
+A column whose "All ..." option is selected is skipped entirely.
+
+Rows appended to the dataset extend the masks in place (``FilterIndex.append``):
+every mask lives in a buffer with spare bytes at its end, and the new bits are
+written behind the bits the current index reads.
+"""
+
+import numpy as np
+import pandas as pd
+
+# The columns behind the three sidebar multiselects
+FILTER_COLUMNS = ('Year', 'Organization type', 'Method')
+
+
+def _factorize(column):
+    # Distinct values and the position of every row's value among them
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return list(column.cat.categories), np.asarray(column.cat.codes)
+    values, codes = np.unique(column.to_numpy(), return_inverse=True)
+    return values.tolist(), codes
+
+
+class FilterIndex:
+    """Packed row bitmasks per distinct value of the filter columns."""
+
+    def __init__(self, n_rows, masks, end=None):
+        self.n_rows = n_rows
+        # {column: {value: packed uint8 bitmask over the rows}}, each a view of a larger buffer
+        self.masks = masks
+        # Rows written to the shared buffers; only the index that ends there may write behind it
+        self._end = end if end is not None else [n_rows]
+
+    @classmethod
+    def build(cls, frame, columns=FILTER_COLUMNS):
+        masks = {}
+        for column in columns:
+            values, codes = _factorize(frame[column])
+            masks[column] = {value: np.packbits(codes == code)
+                             for code, value in enumerate(values)}
+        return cls(len(frame), masks)
+
+    def values(self, column):
+        return sorted(self.masks[column])
+
+    def append(self, delta):
+        """Return the index of these rows followed by the rows of ``delta``.
+
+        The cost is proportional to the rows of ``delta`` (times the values per
+        column); this index stays valid, since it never reads the new bits.
+        """
+        n_rows = self.n_rows + len(delta)
+        n_bytes = (n_rows + 7) // 8
+        start, shift = divmod(self.n_rows, 8)
+        owner = self._end[0] == self.n_rows
+        masks = {}
+        for column, by_value in self.masks.items():
+            values, codes = _factorize(delta[column])
+            positions = dict(zip(values, range(len(values))))
+            masks[column] = {}
+            for value in list(by_value) + [v for v in values if v not in by_value]:
+                packed = by_value.get(value)
+                buffer = packed.base if packed is not None and packed.base is not None else packed
+                if buffer is None or not owner or len(buffer) < n_bytes or not buffer.flags.writeable:
+                    # A new zeroed buffer of twice the size; the old one stays with the older indexes
+                    grown = np.zeros(max(n_bytes, 2 * (start + 1)), dtype=np.uint8)
+                    if packed is not None:
+                        grown[:len(packed)] = packed
+                    buffer = grown
+                bits = codes == positions[value] if value in positions else np.zeros(len(delta), bool)
+                # The last byte of these rows is rewritten with its first ``shift`` bits kept
+                head = np.unpackbits(buffer[start:start + 1], count=shift).view(bool)
+                buffer[start:n_bytes] = np.packbits(np.concatenate([head, bits]))
+                masks[column][value] = buffer[:n_bytes]
+
+        if not owner:
+            return FilterIndex(n_rows, masks)
+        self._end[0] = n_rows
+        return FilterIndex(n_rows, masks, self._end)
+
+    def _any_of(self, column, values):
+        # OR within a column; values that never occur simply select no rows
+        packed = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        by_value = self.masks[column]
+        for value in values:
+            if value in by_value:
+                np.bitwise_or(packed, by_value[value], out=packed)
+        return packed
+
+    def mask(self, selection):
+        """Return the boolean row mask of ``selection``, or None when nothing is filtered.
+
+        ``selection`` maps a filter column to the selected values, where None
+        stands for the "All ..." option of that column.
+        """
+        packed = None
+        for column, values in selection.items():
+            if values is None:
+                continue
+            column_mask = self._any_of(column, values)
+            if packed is None:
+                packed = column_mask
+            else:
+                np.bitwise_and(packed, column_mask, out=packed)
+        if packed is None:
+            return None
+        return np.unpackbits(packed, count=self.n_rows).view(bool)
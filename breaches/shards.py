@@ -0,0 +1,151 @@
+"""
+Breach datasets split into several CSV shards (e.g. one per year or source).
+
+``BREACHES_DATA_PATH`` may name a single CSV, a directory (every ``*.csv`` in
+it) or a glob pattern. The fingerprint of a sharded dataset combines the
+fingerprints of its shards, so a changed shard changes the dataset version.
+
+Loading goes through the Parquet snapshot of every shard
+(``dataset.load_snapshot``, without the entity columns): unchanged shards are
+read back from their snapshots in this process, and only the changed shards are
+parsed and cleaned again, in a process pool with one shard per task (parsing a CSV holds the GIL,
+so threads would not help). The cleaned shards are merged into one frame, with
+the categories of every categorical column unioned (and sorted, like those of
+a single cleaned CSV).
+
+The entities of the merged frame are resolved once, over the names of all
+shards (a name in one shard can be a spelling of an entity in another), so the
+shard snapshots are built without resolving their own. The result is a
+table of the names and their entities, written next to the shards for the
+dataset version, so only the first load after a shard changed resolves them.
+"""
+
+import glob
+import hashlib
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from breaches.config import LOAD_WORKERS
+from breaches.dataset import (SNAPSHOT_VERSION, _write_atomic, file_fingerprint, load_snapshot,
+                              snapshot_is_fresh)
+from breaches.entities import EntityResolver, apply_entities
+from breaches.streaming import RawProfile
+
+# Identity of a sharded dataset: the same fields as dataset.Fingerprint plus the shard fingerprints
+ShardedFingerprint = namedtuple('ShardedFingerprint', ['path', 'size', 'mtime_ns', 'digest', 'shards'])
+
+
+def is_sharded(path):
+    return os.path.isdir(path) or glob.has_magic(path)
+
+
+def shard_paths(path):
+    """The sorted CSV files of a dataset path (a file, a directory or a glob pattern)."""
+    if os.path.isdir(path):
+        path = os.path.join(path, '*.csv')
+    elif not glob.has_magic(path):
+        return [os.path.abspath(path)]
+    paths = sorted(os.path.abspath(p) for p in glob.glob(path) if os.path.isfile(p))
+    if not paths:
+        raise FileNotFoundError('no CSV shards match %s' % path)
+    return paths
+
+
+def dataset_fingerprint(path):
+    """Fingerprint of the dataset at ``path``: a file Fingerprint, or a ShardedFingerprint."""
+    if not is_sharded(path):
+        return file_fingerprint(path)
+    shards = tuple(file_fingerprint(p) for p in shard_paths(path))
+    sha = hashlib.sha256()
+    for shard in shards:
+        sha.update(('%s:%s\n' % (os.path.basename(shard.path), shard.digest)).encode())
+    return ShardedFingerprint(path, sum(s.size for s in shards), max(s.mtime_ns for s in shards),
+                              sha.hexdigest(), shards)
+
+
+def merge_frames(frames):
+    """Concatenate cleaned shard frames, unioning the categories of the categorical columns."""
+    merged = {}
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            merged[column] = union_categoricals(parts, sort_categories=True)
+        else:
+            merged[column] = np.concatenate([part.to_numpy() for part in parts])
+    return pd.DataFrame(merged, columns=frames[0].columns)
+
+
+def merge_profiles(profiles):
+    """Merge the raw profiles of the shards (the quartiles come from their merged sketches)."""
+    merged = RawProfile()
+    for profile in profiles:
+        merged.merge(RawProfile.from_dict(profile))
+    return merged.to_dict()
+
+
+def _pool(workers):
+    # Spawned workers: forking the threaded Streamlit server is not safe
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def _entities_base(paths):
+    return os.path.join(os.path.dirname(paths[0]), 'breaches.entities-v%d' % SNAPSHOT_VERSION)
+
+
+def entities_path(paths, digest):
+    """The table of the resolved entity names of the shards ``paths`` in the dataset version ``digest``."""
+    return '%s-%s.parquet' % (_entities_base(paths), digest[:16])
+
+
+def resolve_shards(frame, paths, digest):
+    """Return the merged ``frame`` with the entities resolved over all the shards, read from the
+    entity table of the dataset version when it was written before."""
+    path = entities_path(paths, digest)
+    try:
+        return apply_entities(frame, pd.read_parquet(path))
+    except (OSError, ValueError, ImportError):
+        pass
+    resolver = EntityResolver()
+    frame = resolver.resolve(frame)
+    try:
+        _write_atomic(path, lambda tmp: resolver.table().to_parquet(tmp, index=False),
+                      max(os.stat(p).st_mtime_ns for p in paths))
+        # The tables of the previous versions of the shards are not read anymore
+        for stale in glob.glob(_entities_base(paths) + '-*.parquet'):
+            if stale != path:
+                os.remove(stale)
+    except (OSError, ImportError):
+        # Read-only deployment or no Parquet engine: the next load resolves them again
+        pass
+    return frame
+
+
+def load_shards(paths, workers=LOAD_WORKERS, digest=None):
+    """Return ``(cleaned frame, raw profile)`` of the shards, cleaned by ``workers`` processes.
+
+    The entities are resolved over all the shards; with the ``digest`` of the dataset, their
+    table is kept for the next load of the same version."""
+    stale = [path for path in paths if not snapshot_is_fresh(path)]
+    loaded = {}
+    workers = min(workers, len(stale))
+    if workers > 1:
+        # Starting processes and sending the frames back only pays off for shards to parse
+        with _pool(workers) as pool:
+            loaded.update(zip(stale, pool.map(partial(load_snapshot, resolve=False), stale)))
+    for path in paths:
+        if path not in loaded:
+            loaded[path] = load_snapshot(path, resolve=False)
+    frames, profiles = zip(*(loaded[path] for path in paths))
+    frame = merge_frames(frames)
+    if digest is None:
+        frame = EntityResolver().resolve(frame)
+    else:
+        frame = resolve_shards(frame, paths, digest)
+    return frame, merge_profiles(profiles)
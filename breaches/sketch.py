@@ -0,0 +1,177 @@
+"""
+Mergeable quantile sketch of the 'Records' values (a KLL sketch).
+
+A sketch keeps a few hundred of the values it has seen, in levels: a value at
+level ``h`` stands for ``2 ** h`` values. When a level is over its capacity it
+is sorted and every other value moves up a level (the odd or the even ones, by
+a coin flip), so the rank of any value is off by about 1% of the count at most
+(for the default ``k``). Sketches of disjoint parts of the data (cube
+cells, CSV chunks, shards, appended rows) merge into the sketch of their union,
+so the quartiles of any selection come from merging the sketches of its cells.
+
+The count, mean, standard deviation, minimum and maximum are kept exactly next
+to the levels, and a sketch of at most ``k`` values is exact, so small cells
+and small datasets get the same summary as ``Series.describe()``.
+"""
+
+import numpy as np
+
+# Values kept at the top level; the lower levels keep geometrically fewer
+DEFAULT_K = 200
+
+# Quantiles of the Records summary, as in Series.describe()
+SUMMARY_QUANTILES = {'25%': 0.25, '50%': 0.5, '75%': 0.75}
+
+
+class QuantileSketch:
+    """KLL quantile sketch with exact moments, extremes and count."""
+
+    def __init__(self, k=DEFAULT_K, seed=0):
+        self.k = k
+        # levels[h] holds the values of weight 2 ** h
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        # The coin flips of the compactions, seeded so a sketch is the same on every load (and
+        # only created by the first compaction, most cell sketches never need one)
+        self._seed = seed
+        self._rng = None
+
+    @classmethod
+    def of(cls, values, k=DEFAULT_K):
+        """The sketch of ``values`` (missing values are ignored)."""
+        sketch = cls(k)
+        sketch.update(values)
+        return sketch
+
+    @classmethod
+    def grouped(cls, values, groups, n_groups, k=DEFAULT_K):
+        """One sketch per group ``0 .. n_groups - 1`` of ``values``, the same as ``of`` on the values
+        of every group (rows of group -1 and missing values are left out).
+
+        The values are sorted by group once, and the count, moments and extremes of all groups
+        come from a few array operations; only a group of more than ``k`` values is compacted.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        keep = (groups >= 0) & ~np.isnan(values)
+        values, groups = values[keep], groups[keep]
+        order = np.lexsort((values, groups))
+        values, groups = values[order], groups[order]
+        starts = np.searchsorted(groups, np.arange(n_groups + 1))
+        counts = np.diff(starts)
+        means = np.bincount(groups, weights=values, minlength=n_groups) / np.maximum(counts, 1)
+        m2 = np.bincount(groups, weights=(values - means[groups]) ** 2, minlength=n_groups)
+
+        sketches = []
+        for group, (start, stop) in enumerate(zip(starts[:-1], starts[1:])):
+            sketch = cls(k)
+            if stop > start:
+                sketch.levels = [values[start:stop]]
+                sketch.count, sketch.mean, sketch.m2 = int(stop - start), means[group], m2[group]
+                sketch.min, sketch.max = values[start], values[stop - 1]
+                if stop - start > k:
+                    sketch._compress()
+            sketches.append(sketch)
+        return sketches
+
+    @classmethod
+    def merged(cls, sketches, k=DEFAULT_K):
+        """A new sketch of the union of ``sketches``, which are left as they are."""
+        union = cls(k)
+        for sketch in sketches:
+            union._merge(sketch)
+        return union
+
+    def update(self, values):
+        """Add the (non missing) ``values`` to the sketch."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        part = QuantileSketch(self.k)
+        part.levels = [values]
+        part.count, part.mean = len(values), values.mean()
+        part.m2 = ((values - part.mean) ** 2).sum()
+        part.min, part.max = values.min(), values.max()
+        self._merge(part)
+
+    def _merge(self, other):
+        if not other.count:
+            return
+        # Chan et al. pairwise update of the mean and the sum of squared deviations
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        self.levels = [np.concatenate([mine, theirs]) if len(theirs) else mine
+                       for mine, theirs in zip(self.levels, other.levels + [np.empty(0)] * len(self.levels))]
+        self._compress()
+
+    def _capacity(self, level):
+        # The top level keeps k values, every level below it two thirds of the one above
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - level))))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                values = np.sort(values)
+                # An odd number of values leaves one behind at this level
+                rest, values = values[:len(values) % 2], values[len(values) % 2:]
+                if self._rng is None:
+                    self._rng = np.random.default_rng(self._seed)
+                promoted = values[self._rng.integers(2)::2]
+                self.levels[level] = rest
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def __len__(self):
+        return self.count
+
+    def quantiles(self, qs):
+        """The approximate quantiles ``qs`` (0 to 1), linearly interpolated like pandas."""
+        if not self.count:
+            return [np.nan] * len(qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, weights = values[order], weights[order]
+        # Every value stands at the middle rank of the values it represents
+        # (the weights add up to the count, a compaction halves the values and doubles their weight)
+        ranks = np.cumsum(weights) - (weights + 1) / 2
+        return [float(np.interp(q * (self.count - 1), ranks, values)) for q in qs]
+
+    def describe(self):
+        """The Records summary of ``Series.describe()``, with approximate quartiles."""
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        summary = {'count': float(self.count), 'mean': self.mean if self.count else np.nan, 'std': std,
+                   'min': self.min if self.count else np.nan}
+        summary.update(zip(SUMMARY_QUANTILES, self.quantiles(list(SUMMARY_QUANTILES.values()))))
+        summary['max'] = self.max if self.count else np.nan
+        return summary
+
+    def to_dict(self):
+        """JSON serializable form of the sketch."""
+        return {'k': self.k, 'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min if self.count else None, 'max': self.max if self.count else None,
+                'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state['k'])
+        sketch.count, sketch.mean, sketch.m2 = state['count'], state['mean'], state['m2']
+        if sketch.count:
+            sketch.min, sketch.max = state['min'], state['max']
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in state['levels']]
+        return sketch
@@ -0,0 +1,242 @@
+"""
+Process-wide store of the cleaned dataset and its indexes.
+
+The cleaned frame, its filter index and its aggregation cube are built once
+per dataset version and shared by every session of the Streamlit process,
+instead of each session holding its own copies. The shared frame is frozen:
+its column buffers are read-only, and sessions only ever get views of it
+(a shallow copy or a filtered copy), so no session can change what the others
+see.
+
+With ``BREACHES_INGEST=stream`` the store holds a ``streaming.StreamedDataset``
+instead, which answers the same queries from aggregates only, and with
+``BREACHES_INGEST=sqlite`` a ``database.SqliteDataset``, which pushes them down
+to a SQLite file. The app only uses the query methods every backend has
+(``values``, ``dtypes``, ``sample``, ``top_entities``, ``top_breaches``,
+``cube.annual``, ``cube.totals``, ``profile`` and ``version``), and the data
+explorer the ``page`` of the backends that keep the rows (``has_rows``). The
+entity search uses ``entity_index`` and ``entity_breaches``.
+
+When rows were only appended to the CSV since the last load, the store parses
+just those rows and appends them to the current dataset: the frame and the
+filter masks grow in their buffers, the cube is combined with the cube of the
+new rows, and the streamed top-K aggregates fold the new rows in. The previous
+version stays valid for the sessions still reading it. A file whose prefix
+changed is reloaded in full.
+
+The spellings of an organization are resolved to one canonical entity (see
+``entities``) once, when the snapshot is built, and the canonical columns are
+read back with the cleaned ones. The first append rebuilds the resolver from
+those columns; the appended names then regroup the entities they touch, and
+the rows of loaded names whose entity changed are labeled again.
+
+A sharded dataset (a directory or glob of CSVs, see ``shards``) is cleaned by a
+process pool, one shard per process, and reuses the snapshot of every
+unchanged shard.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from breaches.appendable import AppendableFrame
+from breaches.config import INGEST, REFRESH
+from breaches.cube import AggregationCube
+from breaches.database import database_path, load_database
+from breaches.dataset import clean_breaches, load_snapshot, prefix_checksum, read_appended
+from breaches.entities import ENTITY_COLUMNS, EntityResolver
+from breaches.entity_search import EntityIndex
+from breaches.explorer import EXPLORER_COLUMNS, page_positions
+from breaches.filter_index import FilterIndex
+from breaches.shards import load_shards
+from breaches.streaming import RawProfile, ingest_csv
+from breaches.topk import top_breaches_per_year, top_entities_per_year
+
+
+def freeze_frame(frame):
+    """Return ``frame`` over read-only views of its column buffers (no copy).
+
+    Any in-place write (``frame.loc[...] = ...``, ``frame[col].values[...] = ...``)
+    then raises ``ValueError: assignment destination is read-only``.
+    """
+    columns = {}
+    for column, values in frame.items():
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # A categorical column writes to its codes
+            codes = np.asarray(values.cat.codes).view()
+            codes.setflags(write=False)
+            columns[column] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+        else:
+            # A view, so the buffers of ``frame`` (e.g. those of an AppendableFrame) stay writable
+            array = values.to_numpy().view()
+            array.setflags(write=False)
+            columns[column] = array
+    # Without copy, every column keeps its own read-only array instead of being consolidated
+    return pd.DataFrame(columns, index=frame.index, copy=False)
+
+
+class BreachDataset:
+    """Read-only cleaned dataset of one version, with its filter index and cube."""
+
+    has_rows = True
+
+    def __init__(self, frame, profile, version, columns=None, filter_index=None, cube=None,
+                 entity_resolver=None, source=None):
+        # The frame comes with its canonical entities; the resolver is only needed for appends and
+        # is shared with the appended versions
+        self._entity_resolver = entity_resolver
+        self.version = version
+        self.profile = profile
+        # Byte offset and prefix checksum of the CSV rows read, where the next append starts (None
+        # when the dataset is reloaded in full instead, see ``DatasetStore``)
+        self.source = source
+        self._columns = columns if columns is not None else AppendableFrame.from_frame(frame)
+        self._frame = freeze_frame(frame)
+        self.filter_index = filter_index if filter_index is not None else FilterIndex.build(frame)
+        self.cube = cube if cube is not None else AggregationCube.build(frame)
+        # Search index of the entity names and the rows of every entity, built on first use
+        self._entity_index = self._entity_rows = None
+
+    def __len__(self):
+        return len(self._frame)
+
+    @property
+    def dtypes(self):
+        return self._frame.dtypes
+
+    def values(self, column):
+        """Sorted distinct values of a filter column (the sidebar options)."""
+        return self.filter_index.values(column)
+
+    def view(self):
+        """The whole dataset as a shallow copy: adding columns to it stays local to the caller."""
+        return self._frame.copy(deep=False)
+
+    def rows(self, selection):
+        """The rows of a filter selection (a filter column -> values mapping, None for all)."""
+        mask = self.filter_index.mask(selection)
+        return self.view() if mask is None else self._frame[mask]
+
+    def sample(self, n, columns, random_state=None):
+        return self._frame[columns].sample(min(n, len(self._frame)), random_state=random_state)
+
+    def top_entities(self, selection, k):
+        """Graph 2 data: the ``k`` entities with the most records per year of the selection."""
+        return top_entities_per_year(self.rows(selection), k)
+
+    def top_breaches(self, selection, k):
+        """Graph 3 data: the ``k`` largest breaches per year of the selection."""
+        return top_breaches_per_year(self.rows(selection), k)
+
+    def page(self, selection, sort_by, ascending=True, start=0, size=50):
+        """Explorer data: rows ``start:start + size`` of the selection sorted by ``sort_by``,
+        and the number of rows in the selection."""
+        positions, total = page_positions(self._frame[sort_by], self.filter_index.mask(selection),
+                                          start, size, ascending)
+        return self._frame.iloc[positions][EXPLORER_COLUMNS], total
+
+    def entity_index(self):
+        """The prefix index of the entity names (see ``entity_search``)."""
+        if self._entity_index is None:
+            self._entity_index = EntityIndex.build(self._frame['Entity_canonical'].cat.categories)
+        return self._entity_index
+
+    def entity_breaches(self, entities):
+        """The breaches of the named (canonical) entities, by year."""
+        entity = self._frame['Entity_canonical']
+        if self._entity_rows is None:
+            # The rows grouped by entity code: the rows of code c are order[starts[c]:starts[c + 1]]
+            codes = np.asarray(entity.cat.codes)
+            order = np.argsort(codes, kind='stable')
+            starts = np.searchsorted(codes[order], np.arange(len(entity.cat.categories) + 1))
+            self._entity_rows = order, starts
+        order, starts = self._entity_rows
+        codes = entity.cat.categories.get_indexer(entities)
+        parts = [order[starts[c]:starts[c + 1]] for c in codes if c >= 0]
+        positions = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        rows = self._frame.iloc[positions][EXPLORER_COLUMNS]
+        return rows.sort_values('Year', kind='stable')
+
+    def append(self, raw, version, source=None):
+        """Return the dataset with the raw rows appended to the CSV, sharing this one's buffers,
+        and the ``source`` of the rows read so far."""
+        if self._entity_resolver is None:
+            self._entity_resolver = EntityResolver.from_frame(self._frame)
+        delta = clean_breaches(raw)
+        changed = self._entity_resolver.add_entities(delta['Entity'])
+        columns = self._columns.append(self._entity_resolver.resolve(delta, add=False))
+        if changed:
+            # Names loaded before joined another entity or got another label: I will label every
+            # row again, from the codes of its 'Entity'
+            columns = columns.replace(self._entity_resolver.resolve(columns.frame(), add=False)[ENTITY_COLUMNS])
+        # The Records summary of the appended CSV comes from the merged sketches of its raw 'Records'
+        profile = RawProfile.from_dict(self.profile)
+        profile.update(raw)
+        return BreachDataset(columns.frame(), profile.to_dict(), version, columns=columns,
+                             filter_index=self.filter_index.append(delta),
+                             cube=AggregationCube.combine([self.cube, AggregationCube.build(delta)]),
+                             entity_resolver=self._entity_resolver, source=source)
+
+
+def load_dataset(fingerprint, ingest=INGEST):
+    """Build the dataset of ``fingerprint``: cleaned rows in memory, or streamed aggregates only."""
+    shards = getattr(fingerprint, 'shards', None)
+    if ingest == 'sqlite':
+        paths = [shard.path for shard in shards] if shards else [fingerprint.path]
+        # A rebuilt database is a new file, it never has to be appended to
+        return load_database(paths, database_path(fingerprint.path), fingerprint.digest)
+    if ingest == 'stream':
+        if shards:
+            return ingest_csv([shard.path for shard in shards], version=fingerprint.digest)
+        return ingest_csv(fingerprint.path, version=fingerprint.digest, source=_read_source(fingerprint))
+    if shards:
+        frame, profile = load_shards([shard.path for shard in shards], digest=fingerprint.digest)
+        return BreachDataset(frame, profile, fingerprint.digest)
+    frame, profile = load_snapshot(fingerprint.path)
+    # The source is taken once the rows are read, so a file that grew meanwhile is not appended to
+    return BreachDataset(frame, profile, fingerprint.digest, source=_read_source(fingerprint))
+
+
+def _read_source(fingerprint):
+    # Byte offset and prefix checksum of the rows of a single CSV, where the next append starts;
+    # None when the file is no longer the size of the fingerprint (it is then reloaded in full).
+    # Shards are reloaded instead, from their snapshots.
+    if os.stat(fingerprint.path).st_size != fingerprint.size:
+        return None
+    return fingerprint.size, prefix_checksum(fingerprint.path, fingerprint.size)
+
+
+class DatasetStore:
+    """The current dataset of every dataset path, rebuilt when its fingerprint changes."""
+
+    def __init__(self, ingest=INGEST, refresh=REFRESH):
+        self.ingest = ingest
+        self.refresh = refresh
+        self._datasets = {}
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint):
+        # The lock makes concurrent sessions wait for one build instead of building in parallel;
+        # the previous version of the path is dropped as soon as the new one is in place
+        with self._lock:
+            dataset = self._datasets.get(fingerprint.path)
+            if dataset is None or dataset.version != fingerprint.digest:
+                dataset = self._refresh(dataset, fingerprint)
+                self._datasets[fingerprint.path] = dataset
+            return dataset
+
+    def _refresh(self, dataset, fingerprint):
+        # I will only parse the appended rows when the part of the file read before is unchanged
+        if dataset is not None and self.refresh == 'append' and dataset.source:
+            offset, checksum = dataset.source
+            appended = read_appended(fingerprint.path, offset, checksum, fingerprint.size)
+            if appended is not None:
+                raw, offset = appended
+                if not len(raw):
+                    # Nothing but a line still being written: the next rerun looks again
+                    return dataset
+                return dataset.append(raw, fingerprint.digest,
+                                      source=(offset, prefix_checksum(fingerprint.path, offset)))
+        return load_dataset(fingerprint, self.ingest)
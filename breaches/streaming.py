@@ -0,0 +1,243 @@
+"""
+Chunked streaming ingest for breach CSVs larger than memory.
+
+``ingest_csv`` reads the CSV chunk by chunk, cleans every chunk with the same
+``clean_breaches`` rules as the in-memory path and folds it into the
+aggregates the data story needs, after which the chunk is dropped:
+
+* the Year × Organization type × Method cube (breaches, Records sum, max and
+  quantile sketch, distinct entities sketch), which also gives the distinct
+  values for the sidebar;
+* per cube cell, the ``max_k`` largest breaches (Graph 3) and the largest
+  entity totals per year (Graph 2);
+* a running profile of the raw file and a uniform sample of cleaned rows for
+  the Data Cleaning and Data Preparation expanders.
+
+The aggregates keep the raw entity names. The names of every chunk are added to
+an entity resolver (which holds the distinct names), and the kept rows get
+their canonical entities once all chunks are read, so the entities are those of
+the in-memory path whatever the chunk a spelling comes from.
+
+Memory is bounded by the number of cells times ``max_k``, not by the rows.
+The top breaches per year of any selection are exact, because they are always
+among the top ``max_k`` of their own cell. The entity totals are a bounded
+heavy-hitter summary: an entity whose partial total falls below the per-cell
+cut in some chunk loses that part, so every cell keeps ``_ENTITY_SLACK`` times
+``max_k`` partial totals to keep the top entities of a selection exact in
+practice.
+"""
+
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+
+from breaches.config import CHUNK_ROWS, MAX_TOP_K
+from breaches.cube import AggregationCube, slice_cells
+from breaches.dataset import clean_breaches
+from breaches.entities import ENTITY_COLUMNS, EntityResolver
+from breaches.entity_search import EntityIndex
+from breaches.explorer import EXPLORER_COLUMNS
+from breaches.filter_index import FILTER_COLUMNS
+from breaches.sketch import QuantileSketch
+from breaches.topk import top_breaches_per_year, top_entities_per_year, top_k_per_group
+
+BREACH_COLUMNS = ['Entity', 'Entity_short', 'Year', 'Records', 'Organization type', 'Method']
+ENTITY_KEYS = ['Entity', 'Entity_short', 'Year', 'Organization type', 'Method']
+
+# Cube cells are merged every so many chunks, so the pending partial cells stay small
+_COMBINE_EVERY = 16
+
+# Partial entity totals kept per cell, as a multiple of max_k
+_ENTITY_SLACK = 8
+
+
+def _keep_top_per_cell(frame, k):
+    # I will keep the k largest 'Records' rows of every Year × Organization type × Method cell
+    cell = frame.groupby(list(FILTER_COLUMNS), observed=True, sort=False).ngroup()
+    kept = top_k_per_group(frame.assign(_cell=cell.to_numpy()), '_cell', 'Records', k)
+    return kept.drop(columns='_cell').reset_index(drop=True)
+
+
+def _as_categories(frame):
+    # Concatenated chunks with different categories fall back to object columns
+    return frame.astype({col: 'category' for col in frame.columns
+                         if col not in ('Year', 'Records', '_key', 'Entity_id')})
+
+
+class RawProfile:
+    """Running version of ``dataset.profile_raw`` over the raw chunks."""
+
+    def __init__(self):
+        self.missing = None
+        self.dtypes = None
+        # Exact count, moments and extremes of the raw 'Records', approximate quartiles
+        self.records = QuantileSketch()
+
+    @classmethod
+    def from_dict(cls, profile):
+        """Resume from a profile dict (``to_dict`` or ``dataset.profile_raw`` output)."""
+        running = cls()
+        running.missing = pd.Series(profile['missing_values'], dtype=np.int64)
+        running.dtypes = pd.Series(profile['data_types'], dtype=object)
+        running.records = QuantileSketch.from_dict(profile['records_sketch'])
+        return running
+
+    def update(self, raw):
+        chunk = RawProfile()
+        chunk.missing = raw.isnull().sum()
+        chunk.dtypes = raw.dtypes.astype(str)
+        chunk.records.update(pd.to_numeric(raw['Records'], errors='coerce').to_numpy(dtype=np.float64))
+        self.merge(chunk)
+
+    def merge(self, other):
+        """Fold the profile of another part of the data (a chunk or a shard) into this one."""
+        self.missing = other.missing if self.missing is None else self.missing.add(other.missing, fill_value=0)
+        # A column typed differently by two parts (e.g. a bad 'Year' in one of them) reads as object
+        self.dtypes = other.dtypes if self.dtypes is None else \
+            other.dtypes.where(other.dtypes == self.dtypes, 'object')
+        self.records = QuantileSketch.merged([self.records, other.records])
+
+    def to_dict(self):
+        return {
+            'missing_values': {col: int(n) for col, n in self.missing.items()},
+            'records_summary': {stat: float(v) for stat, v in self.records.describe().items()},
+            'records_sketch': self.records.to_dict(),
+            'data_types': dict(self.dtypes.items()),
+            # Duplicates need every row at once (or their hashes), so parts cannot count them
+            'duplicates': None,
+        }
+
+
+class StreamedDataset:
+    """Aggregates of a breach CSV, with the same query methods as ``store.BreachDataset``."""
+
+    # Only aggregates and a sample are kept, the explorer has no rows to page through
+    has_rows = False
+
+    def __init__(self, version=None, max_k=MAX_TOP_K, sample_size=1000, seed=0, source=None):
+        self.version = version
+        # Byte offset and prefix checksum of the CSV rows read, where the next append starts
+        self.source = source
+        self.cube = None
+        self.max_k = max_k
+        self.sample_size = sample_size
+        self.seed = seed
+        self._raw_profile = RawProfile()
+        self._pending = []
+        self._breaches = self._entities = self._sample = None
+        self._entity_index = None
+        # Shared with the appended versions, which resolve their new names against the same entities
+        self.entity_resolver = EntityResolver()
+        self._rows = 0
+
+    def __len__(self):
+        return self._rows
+
+    @property
+    def profile(self):
+        return self._raw_profile.to_dict()
+
+    @property
+    def dtypes(self):
+        return self._sample[BREACH_COLUMNS + ENTITY_COLUMNS].dtypes
+
+    def values(self, column):
+        return self.cube.values(column)
+
+    def sample(self, n, columns, random_state=None):
+        sample = self._sample[columns]
+        return sample.sample(min(n, len(sample)), random_state=random_state)
+
+    def top_entities(self, selection, k):
+        return top_entities_per_year(slice_cells(self._entities, selection), k)
+
+    def top_breaches(self, selection, k):
+        return top_breaches_per_year(slice_cells(self._breaches, selection), k)
+
+    def entity_index(self):
+        """The prefix index of the (canonical) entity names kept for Graphs 2 and 3."""
+        if self._entity_index is None:
+            names = pd.concat([self._entities['Entity_canonical'].astype(object),
+                               self._breaches['Entity_canonical'].astype(object)])
+            self._entity_index = EntityIndex.build(names.dropna())
+        return self._entity_index
+
+    def entity_breaches(self, entities):
+        """The kept breaches (the largest per cell) of the named (canonical) entities, by year."""
+        rows = self._breaches[self._breaches['Entity_canonical'].isin(entities)][EXPLORER_COLUMNS]
+        return rows.sort_values('Year', kind='stable')
+
+    def _update(self, raw):
+        # I will fold one raw chunk into the aggregates; every aggregate is replaced, not changed
+        self._raw_profile.update(raw)
+        chunk = clean_breaches(raw)
+        self.entity_resolver.add_entities(chunk['Entity'])
+        # The sample keys of a chunk depend on the rows before it, so an append draws new keys
+        rng = np.random.default_rng((self.seed, self._rows))
+        self._rows += len(chunk)
+
+        self._pending.append(AggregationCube.build(chunk))
+        if len(self._pending) >= _COMBINE_EVERY:
+            self._combine()
+
+        self._breaches = _keep_top_per_cell(
+            pd.concat([self._breaches, chunk[BREACH_COLUMNS]], ignore_index=True), self.max_k)
+
+        entity_totals = chunk.groupby(ENTITY_KEYS, observed=True)['Records'].sum().reset_index()
+        entity_totals = pd.concat([self._entities, entity_totals], ignore_index=True)\
+            .groupby(ENTITY_KEYS, observed=True)['Records'].sum().reset_index()
+        self._entities = _keep_top_per_cell(entity_totals, self.max_k * _ENTITY_SLACK)
+
+        # Bottom-k sampling: every row draws a random key and the sample_size smallest keys stay,
+        # which is a uniform sample of all the rows seen so far
+        keyed = chunk[BREACH_COLUMNS].assign(_key=rng.random(len(chunk)))
+        self._sample = pd.concat([self._sample, keyed], ignore_index=True)\
+            .nsmallest(self.sample_size, '_key')
+
+    def _combine(self):
+        self.cube = AggregationCube.combine(([self.cube] if self.cube else []) + self._pending)
+        self._pending = []
+
+    def _finish(self):
+        self._combine()
+        # The entities of the kept rows are labeled once all names are in the resolver
+        self._breaches = self.entity_resolver.resolve(_as_categories(self._breaches), add=False)
+        self._entities = self.entity_resolver.resolve(_as_categories(self._entities), add=False)
+        self._sample = self.entity_resolver.resolve(_as_categories(self._sample), add=False)
+
+    def append(self, raw, version, source=None):
+        """Return the aggregates with the raw rows appended to the CSV folded in.
+
+        This dataset is left as it is (sessions may still read it); the new one
+        costs the size of ``raw``, since all aggregates are bounded.
+        """
+        appended = copy.copy(self)
+        appended._raw_profile = copy.copy(self._raw_profile)
+        appended._pending = []
+        appended._entity_index = None
+        appended.version = version
+        appended.source = source
+        appended._update(raw)
+        appended._finish()
+        return appended
+
+
+def ingest_csv(path, version=None, chunk_rows=CHUNK_ROWS, max_k=MAX_TOP_K, sample_size=1000, seed=0,
+               source=None):
+    """Stream ``path`` (or a list of shard paths, one after the other) in chunks of
+    ``chunk_rows`` rows and return its StreamedDataset.
+
+    ``source`` is the ``(size, prefix checksum)`` of a single CSV taken before streaming it; it is
+    dropped when the file grew meanwhile, since the rows read may then go past that size."""
+    dataset = StreamedDataset(version, max_k, sample_size, seed, source)
+    for shard in [path] if isinstance(path, str) else path:
+        for raw in pd.read_csv(shard, chunksize=chunk_rows):
+            dataset._update(raw)
+    if dataset._breaches is None:
+        raise ValueError('%s holds no breaches' % (path,))
+    if source is not None and os.stat(path).st_size != source[0]:
+        dataset.source = None
+    dataset._finish()
+    return dataset
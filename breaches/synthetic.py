@@ -0,0 +1,133 @@
+"""
+Seeded generator of synthetic breach datasets for load tests and benchmarks.
+
+The generated CSVs follow the schema of data_breaches.csv (Entity, Year,
+Records, Organization type, Method) with the same kind of mess the cleaning
+has to deal with: heavy-tailed 'Records', inconsistent casing and whitespace
+in 'Organization type' and 'Method', and a small share of invalid 'Year'
+values. Rows are generated and written chunk by chunk, so any row count can be
+produced with bounded memory.
+
+    python -m breaches.synthetic --rows 10000000 --seed 7 breaches_10m.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Base values as they appear in the Kaggle dataset, with roughly its frequencies
+ORGANIZATION_TYPES = {
+    'web': 49, 'healthcare': 45, 'financial': 36, 'government': 27, 'retail': 20, 'tech': 14,
+    'telecoms': 12, 'academic': 12, 'gaming': 10, 'social network': 8, 'military': 6,
+    'transport': 5, 'energy': 3, 'hotel': 3, 'government, healthcare': 2, 'tech, retail': 2,
+    'media': 2, 'social media': 2, 'data broker': 1, 'restaurant': 1, 'banking': 1,
+}
+METHODS = {
+    'hacked': 156, 'poor security': 36, 'lost / stolen media': 32, 'inside job': 18,
+    'accidentally published': 17, 'lost / stolen computer': 15, 'unknown': 4,
+    'poor security/inside job': 2, 'improper setting, hacked': 2, 'unsecured S3 bucket': 1,
+    'social engineering': 1, 'rogue contractor': 1, 'data exposed by misconfiguration': 1,
+}
+# Year values the cleaning has to drop, as found in the Kaggle dataset and in exports
+INVALID_YEARS = ['2014 and 2015', '2018-2019', 'unknown', '']
+
+_NAME_PARTS = [
+    ['Global', 'First', 'United', 'National', 'Pacific', 'Northern', 'Blue', 'Silver', 'Metro',
+     'Prime', 'Apex', 'Summit', 'Royal', 'Atlantic', 'Green', 'Civic', 'Union', 'Eastern'],
+    ['Health', 'Bank', 'Telecom', 'Retail', 'Media', 'Data', 'Cloud', 'Energy', 'Insurance',
+     'Airlines', 'Games', 'Software', 'Hotels', 'Networks', 'Credit', 'University', 'Logistics'],
+    ['Inc.', 'Corp', 'Group', 'Ltd', 'Holdings', 'Services', 'International', 'Systems', 'Co.',
+     'Partners', 'Solutions', ''],
+]
+
+
+def _choice(rng, weights, size):
+    values = np.array(list(weights), dtype=object)
+    p = np.array(list(weights.values()), dtype=float)
+    return values[rng.choice(len(values), size=size, p=p / p.sum())]
+
+
+def _messy(rng, values, share):
+    # I will garble the casing and whitespace of a share of the values, like a careless data entry
+    values = values.copy()
+    rows = np.flatnonzero(rng.random(len(values)) < share)
+    styles = rng.integers(0, 5, len(rows))
+    garble = [
+        lambda s: s.str.upper(),
+        lambda s: s.str.title(),
+        lambda s: s.str.capitalize(),
+        lambda s: '  ' + s + ' ',
+        lambda s: s.str.replace(' ', '  ', regex=False),
+    ]
+    for style, apply in enumerate(garble):
+        picked = rows[styles == style]
+        values[picked] = apply(pd.Series(values[picked], dtype=object)).to_numpy()
+    return values
+
+
+def _entity_names(ids):
+    # Every entity id maps to a stable name; ids beyond the name combinations get a number.
+    # Names are built once per distinct id and spread over the rows afterwards.
+    ids, rows = np.unique(ids, return_inverse=True)
+    first, second, third = (np.array(part, dtype=object) for part in _NAME_PARTS)
+    combos = len(first) * len(second) * len(third)
+    names = (first[ids % len(first)] + ' ' + second[(ids // len(first)) % len(second)] + ' '
+             + third[(ids // (len(first) * len(second))) % len(third)])
+    names = np.array([name.strip() for name in names], dtype=object)
+    numbered = ids >= combos
+    names[numbered] = names[numbered] + ' ' + (ids[numbered] // combos).astype(str).astype(object)
+    return names[rows]
+
+
+def generate_chunk(rng, rows, n_entities, years=(2004, 2021), messy_share=0.2, invalid_year_share=0.005):
+    """Return one DataFrame of ``rows`` synthetic breaches (raw, before cleaning)."""
+    # A few entities are breached over and over (Zipf), most of them once or twice
+    ids = (rng.zipf(1.3, rows) - 1) % n_entities
+
+    year = rng.integers(years[0], years[1] + 1, rows).astype(str).astype(object)
+    invalid = rng.random(rows) < invalid_year_share
+    year[invalid] = np.array(INVALID_YEARS, dtype=object)[rng.integers(0, len(INVALID_YEARS), invalid.sum())]
+
+    # Log-normal body with a Pareto tail: most breaches expose thousands to millions of
+    # records, a handful expose billions (Yahoo, Aadhaar, ...)
+    records = rng.lognormal(mean=np.log(2e5), sigma=2.0, size=rows)
+    tail = rng.random(rows) < 0.01
+    records[tail] = 1e7 * (rng.pareto(1.1, tail.sum()) + 1)
+    records = np.clip(records, 1, 5e9).astype(np.int64)
+
+    return pd.DataFrame({
+        'Entity': _entity_names(ids),
+        'Year': year,
+        'Records': records,
+        'Organization type': _messy(rng, _choice(rng, ORGANIZATION_TYPES, rows), messy_share),
+        'Method': _messy(rng, _choice(rng, METHODS, rows), messy_share),
+    })
+
+
+def write_synthetic_csv(path, rows, seed=0, chunk_rows=500_000, n_entities=None, **options):
+    """Stream ``rows`` synthetic breaches to ``path`` in chunks and return ``path``.
+
+    The output only depends on ``seed``, ``rows``, ``chunk_rows`` and the options.
+    """
+    rng = np.random.default_rng(seed)
+    if n_entities is None:
+        n_entities = max(rows // 4, 1)
+    with open(path, 'w', newline='') as handle:
+        for start in range(0, max(rows, 1), chunk_rows):
+            size = min(chunk_rows, rows - start)
+            chunk = generate_chunk(rng, size, n_entities, **options)
+            chunk.to_csv(handle, header=start == 0, index=False)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic breach CSV.')
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=500_000)
+    parser.add_argument('--entities', type=int, help='number of distinct entities (default: rows / 4)')
+    args = parser.parse_args()
+    write_synthetic_csv(args.path, args.rows, seed=args.seed, chunk_rows=args.chunk_rows,
+                        n_entities=args.entities)
@@ -0,0 +1,82 @@
+"""
+Section-level timing of one rerun of the data story.
+
+The app opens a ``RerunTimer`` at the top of the script and wraps its sections
+(load, cleaning diagnostics, sidebar filter, aggregation, figure build and
+rendering of every graph) in ``timer.section(...)``. Every rerun appends one
+JSON line to the timing log, and the sidebar debug panel shows the same records.
+The log is rotated once it reaches ``TIMING_LOG_MAX_BYTES`` (the previous log is
+kept as ``timings.jsonl.1``), so a long-running deployment keeps at most twice
+that size on disk.
+"""
+
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+from breaches.config import TIMING_LOG, TIMING_LOG_MAX_BYTES
+
+
+def _rotate(path, max_bytes):
+    # I will move a full log to ``path.1`` (replacing the older one) and start a new one
+    try:
+        if max_bytes and os.stat(path).st_size >= max_bytes:
+            os.replace(path, path + '.1')
+    except OSError:
+        pass
+
+
+class RerunTimer:
+    """Wall time (and optional row count) of the named sections of one rerun."""
+
+    def __init__(self, script='Streamlit.py'):
+        self.script = script
+        self.run_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.sections = []
+
+    @contextmanager
+    def section(self, name, rows=None):
+        """Time the ``with`` block; the yielded record can be completed (e.g. ``record['rows']``)."""
+        record = {'section': name, 'seconds': None, 'rows': rows}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self.sections.append(record)
+
+    @property
+    def total_seconds(self):
+        return time.perf_counter() - self._started
+
+    def to_frame(self):
+        frame = pd.DataFrame(self.sections, columns=['section', 'seconds', 'rows'])
+        frame['ms'] = (frame['seconds'] * 1000).round(2)
+        frame['rows'] = frame['rows'].astype('Int64')
+        return frame[['section', 'ms', 'rows']]
+
+    def to_record(self):
+        return {
+            'run_id': self.run_id,
+            'script': self.script,
+            'timestamp': self.started_at,
+            'total_seconds': self.total_seconds,
+            'sections': self.sections,
+        }
+
+    def write_jsonl(self, path=TIMING_LOG, max_bytes=TIMING_LOG_MAX_BYTES):
+        """Append the rerun as one JSON line, rotating a full log; logging never breaks the app."""
+        if not path:
+            return
+        _rotate(path, max_bytes)
+        try:
+            with open(path, 'a') as handle:
+                handle.write(json.dumps(self.to_record(), default=str) + '\n')
+        except OSError:
+            pass
@@ -0,0 +1,56 @@
+"""
+Top-K rows per group for the entity charts.
+
+``groupby(...).apply(lambda x: x.nlargest(k, ...))`` calls a Python function per
+group and concatenates the pieces again. Here the rows are sorted once by
+(group, value descending), ranked within their group by their distance to the
+group start, and the rows ranked below K are taken in a single ``iloc``.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def top_k_per_group(frame, group, value, k):
+    """Return the ``k`` rows with the largest ``value`` within each ``group``.
+
+    Same rows and order as ``frame.dropna(subset=[value]).groupby(group).apply(lambda x: x.nlargest(k, value))``
+    (groups ascending, values descending, ties in frame order). The rows without a value are
+    dropped first, since ``nlargest`` keeps them in a group of at most ``k`` rows.
+    """
+    n_rows = len(frame)
+    if n_rows == 0 or k <= 0:
+        return frame.iloc[:0]
+
+    groups = frame[group]
+    if isinstance(groups.dtype, pd.CategoricalDtype):
+        groups = groups.cat.codes
+    groups = groups.to_numpy()
+    values = frame[value].to_numpy(dtype=np.float64)
+
+    # np.lexsort sorts by the last key first and is stable, so equal values keep their
+    # frame order; NaN values (negated) sort behind every number of their group
+    order = np.lexsort((-values, groups))
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    sizes = np.diff(np.r_[starts, n_rows])
+    rank = np.arange(n_rows) - np.repeat(starts, sizes)
+
+    keep = order[(rank < k) & ~np.isnan(values[order])]
+    return frame.iloc[keep]
+
+
+def top_entities_per_year(rows, k):
+    """Graph 2 data: the ``k`` entities with the most 'Records (millions)' per year."""
+    # I will group data by canonical entity and Year and then calculate the sum of records affected for
+    # each group ('Records' is already in millions since cleaning, so I only name it accordingly for the
+    # chart, and 'Entity_canonical_short' holds the first three words of the entity name for readability)
+    graph2_data = rows.groupby(['Entity_canonical', 'Entity_canonical_short', 'Year'], observed=True)['Records']\
+        .sum().reset_index().rename(columns={'Records': 'Records (millions)'})
+    return top_k_per_group(graph2_data, 'Year', 'Records (millions)', k).reset_index(drop=True)
+
+
+def top_breaches_per_year(rows, k):
+    """Graph 3 data: the ``k`` largest breaches per year, with their entity and method."""
+    graph3_data = rows.rename(columns={'Records': 'Records (millions)'})
+    return top_k_per_group(graph3_data, 'Year', 'Records (millions)', k).reset_index(drop=True)
@@ -0,0 +1,108 @@
+"""
+Year-range queries from cumulative (prefix-sum) arrays over the years.
+
+The cube cells are laid out once per dataset version as dense arrays indexed by
+(year, organization type, method), and the breaches and records are summed
+cumulatively along the years. The breaches or records of a range of years in a
+cell are then the difference of two prefix rows, so the totals and the
+per-method breakdown of the year-range slider cost the same for any range and
+any number of rows: one subtraction per selected (organization type, method)
+pair. Graph 1 is read from the same arrays (the per-year values are the
+differences of neighbouring prefix rows). The largest breach of a range is a
+maximum, which has no prefix form, and is taken over the range of the dense
+per-year maxima instead.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _positions(values, selected):
+    # Positions of the selected values in the sorted ``values`` (all of them for None)
+    if selected is None:
+        return np.arange(len(values))
+    positions = np.searchsorted(values, selected) if len(values) else np.zeros(len(selected), dtype=np.int64)
+    found = positions < len(values)
+    found[found] = values[positions[found]] == np.asarray(selected, dtype=object)[found]
+    return np.unique(positions[found])
+
+
+class YearRangeSums:
+    """Prefix sums over the years of the Breaches and Records of every (Organization type, Method)."""
+
+    def __init__(self, first_year, org_types, methods, breaches, records, largest):
+        self.first_year = first_year
+        # Sorted values of the other two filter columns, the second and third axes of the arrays
+        self.org_types = org_types
+        self.methods = methods
+        # breaches[i] and records[i] sum the years before first_year + i, largest[i] is the year itself
+        self.breaches = breaches
+        self.records = records
+        self.largest = largest
+
+    @property
+    def years(self):
+        """First and last year of the arrays."""
+        return self.first_year, self.first_year + len(self.largest) - 1
+
+    @classmethod
+    def from_cells(cls, cells):
+        """Lay out cube cells ('Year', 'Organization type', 'Method', 'Breaches', 'Records', 'Largest')."""
+        years = cells['Year'].to_numpy(dtype=np.int64)
+        org_types, org_codes = np.unique(cells['Organization type'].astype(str).to_numpy(), return_inverse=True)
+        methods, method_codes = np.unique(cells['Method'].astype(str).to_numpy(), return_inverse=True)
+        first_year = int(years.min()) if len(years) else 0
+        shape = (int(years.max()) - first_year + 1 if len(years) else 0, len(org_types), len(methods))
+
+        breaches, records, largest = np.zeros(shape), np.zeros(shape), np.full(shape, np.nan)
+        index = (years - first_year, org_codes, method_codes)
+        breaches[index] = cells['Breaches'].to_numpy(dtype=np.float64)
+        records[index] = cells['Records'].to_numpy(dtype=np.float64)
+        largest[index] = cells['Largest'].to_numpy(dtype=np.float64)
+
+        # I will prepend a row of zeros, so the sum of the years i to j is prefix[j + 1] - prefix[i]
+        zeros = np.zeros((1,) + shape[1:])
+        return cls(first_year, org_types, methods,
+                   np.concatenate([zeros, breaches.cumsum(axis=0)]), np.concatenate([zeros, records.cumsum(axis=0)]),
+                   largest)
+
+    def _range(self, year_range, selection):
+        # Prefix rows of the year range (clipped to the arrays) and the selected cell positions
+        n_years = len(self.largest)
+        start = int(np.clip(year_range[0] - self.first_year, 0, n_years))
+        stop = int(np.clip(year_range[1] - self.first_year + 1, start, n_years))
+        orgs = _positions(self.org_types, selection.get('Organization type'))
+        methods = _positions(self.methods, selection.get('Method'))
+        return start, stop, np.ix_(orgs, methods)
+
+    def totals(self, year_range, selection):
+        """Breaches, Records and Largest of the years ``(first, last)`` of ``year_range`` and the
+        Organization type and Method of ``selection`` (None for all)."""
+        start, stop, cells = self._range(year_range, selection)
+        largest = self.largest[start:stop][(slice(None),) + cells]
+        return {
+            'Breaches': int(round((self.breaches[stop] - self.breaches[start])[cells].sum())),
+            'Records': float((self.records[stop] - self.records[start])[cells].sum()),
+            'Largest': float(np.nanmax(largest)) if np.isfinite(largest).any() else 0.0,
+        }
+
+    def methods_breakdown(self, year_range, selection):
+        """Breaches and Records per method of the year range and selection, by decreasing Records."""
+        start, stop, cells = self._range(year_range, selection)
+        breaches = (self.breaches[stop] - self.breaches[start])[cells].sum(axis=0)
+        records = (self.records[stop] - self.records[start])[cells].sum(axis=0)
+        methods = self.methods[cells[1].ravel()]
+        breakdown = pd.DataFrame({'Method': methods, 'Breaches': breaches.round().astype(np.int64),
+                                  'Records': records})
+        return breakdown[breakdown['Breaches'] > 0].sort_values('Records', ascending=False, kind='stable')\
+            .reset_index(drop=True)
+
+    def annual(self, year_range, selection):
+        """Breaches and Records per year of the year range and selection (years with breaches only)."""
+        start, stop, cells = self._range(year_range, selection)
+        # The values of year i are the difference of the prefix rows i + 1 and i
+        breaches = np.diff(self.breaches[start:stop + 1][(slice(None),) + cells].sum(axis=(1, 2)))
+        records = np.diff(self.records[start:stop + 1][(slice(None),) + cells].sum(axis=(1, 2)))
+        annual = pd.DataFrame({'Year': np.arange(start, stop) + self.first_year,
+                               'Breaches': breaches.round().astype(np.int64), 'Records': records})
+        return annual[annual['Breaches'] > 0].reset_index(drop=True)
@@ -0,0 +1,279 @@
+"""
+Shared part of the pages of the data story (Streamlit.py and the scripts in pages/).
+
+Streamlit reruns only the script of the page that is open, so every page loads
+the dataset through the cached loaders below and computes nothing but its own
+sections. The dataset, its diagnostics and the built figures are cached per
+process, so switching pages does not load or build anything twice.
+
+The sidebar filters are drawn by the chart pages only. Streamlit forgets the
+state of widgets a page did not draw, so the filter values are also kept in
+``st.session_state[FILTER_STATE]`` and restored as the widget defaults when a
+chart page is opened again.
+"""
+
+import streamlit as st
+
+from breaches.config import DATA_PATH, MAX_TOP_K
+from breaches.dataset import read_breaches
+from breaches.diagnostics import dataset_diagnostics
+from breaches.figure_cache import FigureCache, canonical_selection
+from breaches.shards import dataset_fingerprint, shard_paths
+from breaches.store import DatasetStore
+from breaches.timing import RerunTimer
+
+# Session state key of the filter values shared by the chart pages
+FILTER_STATE = 'story_filters'
+
+# Entity names the sidebar search matches (and highlights) at most
+SEARCH_LIMIT = 20
+
+
+# I will keep one cleaned dataset (with its filter index and aggregation cube) per process,
+# shared read-only by every session and rebuilt only when the file fingerprint (path, size,
+# mtime and content hash) changes. A cold start reads the Parquet snapshot instead of the CSV,
+# and with BREACHES_INGEST=stream only the aggregates of the charts are kept, never the rows.
+# Rows appended to the CSV are parsed on their own and added to the shared dataset, and
+# BREACHES_DATA_PATH may also name a directory (or glob) of CSV shards, cleaned in parallel.
+# BREACHES_INGEST=sqlite serves every query below from a SQLite file built next to the CSV.
+@st.experimental_singleton(show_spinner=False)
+def load_dataset_store():
+    return DatasetStore()
+
+
+@st.experimental_memo(show_spinner=False)
+def load_preview(fingerprint, rows=5):
+    # A sharded dataset is previewed from its first shard
+    return read_breaches(shard_paths(fingerprint.path)[0], nrows=rows)
+
+
+# The tables of the Data Cleaning and Data Preparation expanders, computed once per dataset
+# version (the dataset itself is not hashed, its version is the key)
+@st.experimental_memo(show_spinner=False, max_entries=4)
+def load_diagnostics(version, _dataset):
+    return dataset_diagnostics(_dataset)
+
+
+# One bounded figure cache per process, shared by every session
+@st.experimental_singleton(show_spinner=False)
+def load_figure_cache():
+    return FigureCache(maxsize=256)
+
+
+def load_dataset(rerun_timer):
+    """Return ``(fingerprint, dataset)`` of the configured dataset, timed as the 'Load' section."""
+    with rerun_timer.section('Load') as section:
+        fingerprint = dataset_fingerprint(DATA_PATH)
+        dataset = load_dataset_store().get(fingerprint)
+        section['rows'] = len(dataset)
+    return fingerprint, dataset
+
+
+def _restored(saved, options, default):
+    # Saved values that are no longer options (e.g. after the dataset changed) are dropped
+    values = [value for value in saved if value in options] if saved is not None else []
+    return values or default
+
+
+def _seed_widget(key, value, is_valid=None):
+    # Streamlit 1.12 hashes the default of a widget into its id, so a default that follows the saved
+    # filters changes the id on every interaction and the next click is lost. The widgets are drawn
+    # with their key only, and their state is seeded here when the page draws them for the first time
+    # (or when the saved state is no longer valid, e.g. after the dataset changed)
+    if key not in st.session_state or (is_valid is not None and not is_valid(st.session_state[key])):
+        st.session_state[key] = value
+
+
+def _restored_range(saved, lo, hi):
+    # A saved year range clipped to the years of the dataset, the whole span by default
+    if saved is None:
+        return lo, hi
+    first, last = max(lo, min(saved[0], hi)), min(hi, max(saved[1], lo))
+    return (first, last) if first <= last else (lo, hi)
+
+
+def selected_year_range():
+    """The ``(first, last)`` years of the sidebar range slider, None when single years are selected."""
+    saved = st.session_state.get(FILTER_STATE, {})
+    return tuple(saved['year_range']) if saved.get('year_range_mode') and saved.get('year_range') else None
+
+
+def sidebar_filters(dataset, top_k=None):
+    """Draw the sidebar filters and return ``(filter_selection, selected years, K)``.
+
+    ``top_k`` is the ``(label, key, default)`` of the page's Top-K slider, if it has one.
+    In ``filter_selection`` None stands for an "All ..." option (or the whole span of the
+    year range slider, see ``selected_year_range``).
+    """
+    saved = st.session_state.setdefault(FILTER_STATE, {})
+
+    # Sidebar header for filter options
+    st.sidebar.header('Data Story Filter Options')
+
+    # I will batch the filters in a form by default, so picking several years and methods costs one
+    # rerun when "Apply Filters" is pressed instead of one rerun per click (the toggle restores live filters)
+    _seed_widget('apply_filters_in_batch', saved.get('apply_filters_in_batch', True))
+    apply_filters_in_batch = st.sidebar.checkbox('Apply filters with a button', key='apply_filters_in_batch',
+                                                 help="Untick to update the graphs on every change.")
+    saved['apply_filters_in_batch'] = apply_filters_in_batch
+    # I will offer a range slider for the years, the common way to pick a span of years
+    _seed_widget('year_range_mode', saved.get('year_range_mode', False))
+    year_range_mode = st.sidebar.checkbox('Select a range of years', key='year_range_mode',
+                                          help="Pick the first and last year instead of single years.")
+    saved['year_range_mode'] = year_range_mode
+    filter_options = st.sidebar.form('filter_options') if apply_filters_in_batch else st.sidebar
+
+    selection, selected_years = {}, None
+    for column, label, all_option, key in [
+            ('Year', 'Select Years:', "All Years", 'filter_years'),
+            ('Organization type', 'Select Organization Types:', "All Organization Types", 'filter_org_types'),
+            ('Method', 'Select Data Breach Methods:', "All Methods", 'filter_methods')]:
+        values = dataset.values(column)
+        if column == 'Year' and year_range_mode and values:
+            # The years between the ends of the slider, None when the whole span is selected
+            lo, hi = values[0], values[-1]
+            if lo == hi:
+                # A slider needs two different ends: the only year of the dataset is the whole span
+                filter_options.caption(f"{label} {lo} (the only year in the data)")
+                first = last = lo
+            else:
+                _seed_widget('filter_year_range', _restored_range(saved.get('year_range'), lo, hi),
+                             is_valid=lambda ends: lo <= ends[0] <= ends[1] <= hi)
+                first, last = filter_options.slider(label, min_value=lo, max_value=hi, key='filter_year_range')
+            saved['year_range'] = (first, last)
+            selected_years = [year for year in values if first <= year <= last]
+            selection[column] = None if (first, last) == (lo, hi) else selected_years
+            continue
+
+        # I will multiselect the values of the column, with a default option for all of them
+        options = [all_option] + values
+        _seed_widget(key, _restored(saved.get(key), options, [all_option]),
+                     is_valid=lambda selected: all(value in options for value in selected))
+        selected = filter_options.multiselect(label, options=options, key=key)
+        saved[key] = selected
+
+        # If the "All ..." option is selected, I will include all values in the filter
+        all_selected = all_option in selected
+        selection[column] = None if all_selected else selected
+        if column == 'Year':
+            selected_years = values if all_selected else selected
+
+    # I will let the reader choose how many of the biggest breaches per year the page's graph shows
+    k = None
+    if top_k is not None:
+        label, key, default = top_k
+        # (the streamed aggregates keep the top MAX_TOP_K breaches of every cell, so K stops there)
+        _seed_widget(key, min(saved.get(key, default), MAX_TOP_K), is_valid=lambda k: 1 <= k <= MAX_TOP_K)
+        k = filter_options.slider(label, min_value=1, max_value=MAX_TOP_K, key=key)
+        saved[key] = k
+
+    # In batch mode the graphs only change when the whole selection is applied
+    if apply_filters_in_batch:
+        filter_options.form_submit_button('Apply Filters')
+    return selection, selected_years, k
+
+
+# Style the DataFrame Table with highlight rows
+def highlight_rows(s):
+    # Apply the red background to even rows
+    return ['background-color: #FF4B4B'
+            if row % 2 == 0
+            else '' for row in range(len(s))]
+
+
+def sidebar_entity_search(dataset, rerun_timer):
+    """Draw the entity search box and return the entity names that match the query."""
+    saved = st.session_state.setdefault(FILTER_STATE, {})
+
+    # I will look up the entity names in a prefix index (built once per dataset version), so a
+    # query costs a few binary searches instead of a scan over all the names
+    _seed_widget('entity_search', saved.get('entity_search', ''))
+    query = st.sidebar.text_input('Search Entities:', placeholder='e.g. Yahoo or Marriott', key='entity_search')
+    saved['entity_search'] = query
+    if not query.strip():
+        return []
+    with rerun_timer.section('Entity search') as section:
+        entities = dataset.entity_index().search(query, SEARCH_LIMIT)
+        section['rows'] = len(entities)
+    if entities:
+        st.sidebar.caption(f"{len(entities)} matching entities are highlighted in the graph.")
+    else:
+        st.sidebar.caption("No entity matches the search.")
+    return entities
+
+
+def entity_search_results(dataset, entities, rerun_timer):
+    """Show the breaches of the entities the sidebar search matched."""
+    if not entities:
+        return
+    with st.expander(f"Breaches of the entities matching the search ({len(entities)})"):
+        with rerun_timer.section('Entity breaches') as section:
+            breaches = dataset.entity_breaches(entities)
+            section['rows'] = len(breaches)
+        breaches = breaches.rename(columns={'Records': 'Records (millions)'}).reset_index(drop=True)
+        st.dataframe(breaches.style.apply(highlight_rows, axis=0).format({'Records (millions)': '{:,.2f}'}))
+
+
+def figure_cache_key(dataset, filter_selection):
+    """Key the built figures on the dataset version and the canonical selection, so an
+    unchanged selection (e.g. the default "All ..." one) is served from the figure cache."""
+    return dataset.version, canonical_selection(filter_selection)
+
+
+def sidebar_about():
+    """Draw the About Me and Contact Me sections and the timing panel switch.
+
+    Returns the ``(show timing panel, panel container)`` for ``finish_page``.
+    """
+    # Sidebar header for About Me
+    st.sidebar.header('About Me')
+
+    # I will define a column layout
+    col1, col2 = st.sidebar.columns([1.6, 2])
+
+    # I will add my image to the left column
+    with col1:
+        st.image("Me.jpg", width=120)
+
+    # I will add the text to the right column
+    with col2:
+        st.error("""
+        I am a dedicated student at HU pursuing a minor in Big Data & Design
+        """)
+
+    # Sidebar header for Contact Me
+    st.sidebar.header('Contact Me')
+
+    # I will display my social media links with icons
+    st.sidebar.success("""
+You can connect with me on:
+
+[![LinkedIn](https://img.icons8.com/color/20/000000/linkedin.png)](https://www.linkedin.com/your_profile) LinkedIn
+
+[![WhatsApp](https://img.icons8.com/color/20/000000/whatsapp.png)](https://wa.link/9ge1o6) WhatsApp
+
+[![Facebook](https://img.icons8.com/color/20/000000/facebook-new.png)](https://www.facebook.com/singh.amandeep.saini.2e) Facebook
+""")
+
+    # I will offer an opt-in debug panel with the section timings of this rerun (filled in at the end)
+    show_timing_panel = st.sidebar.checkbox('Show timing debug panel', value=False, key='show_timing_panel')
+    return show_timing_panel, st.sidebar.container()
+
+
+def start_page(script):
+    """Time the sections of this rerun of ``script`` (debug panel and timings.jsonl)."""
+    return RerunTimer(script=script)
+
+
+def finish_page(rerun_timer, timing_panel):
+    """Log the timings of this rerun and show them in the sidebar when the debug panel is on."""
+    rerun_timer.write_jsonl()
+
+    show_timing_panel, container = timing_panel
+    if show_timing_panel:
+        figure_cache = load_figure_cache()
+        with container:
+            st.markdown("**Rerun Timings**")
+            st.dataframe(rerun_timer.to_frame())
+            st.caption(f"Total: {rerun_timer.total_seconds * 1000:,.1f} ms, "
+                       f"figure cache: {figure_cache.hits} hits / {figure_cache.misses} misses")
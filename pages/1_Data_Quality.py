@@ -0,0 +1,129 @@
+"""
+Data Quality page of the data story: the cleaning and preparation diagnostics.
+"""
+
+import streamlit as st
+
+from data_story import finish_page, load_dataset, load_diagnostics, sidebar_about, start_page
+
+
+# I will time the sections of every rerun of this page (debug panel and timings.jsonl)
+rerun_timer = start_page('pages/1_Data_Quality.py')
+
+# Load the dataset shared by all pages
+_, breaches_dataset = load_dataset(rerun_timer)
+
+# The sidebar of this page has no filters, the diagnostics describe the whole dataset
+timing_panel = sidebar_about()
+
+
+
+# =============================================================================
+# Clean Data
+# =============================================================================
+
+# Data Cleaning & Preperation title with CSS for centering
+st.markdown("<h2 style='text-align: center;'>Data Cleaning & Preperation</h2>",
+            unsafe_allow_html=True)
+
+# Data cleaning
+with st.expander("Data Cleaning"), rerun_timer.section('Clean'):
+
+    # I will look up the diagnostics of this dataset version (computed on the first rerun only)
+    diagnostics = load_diagnostics(breaches_dataset.version, breaches_dataset)
+
+    # Expain what the data cleaning step shows
+    st.markdown("<h6 style='text-align: center;'>The data cleaning process has revealed the following:</h6>",
+                unsafe_allow_html=True)
+
+    # Use columns to layout the elements side by side (3 columns)
+    col1, col2, col3 = st.columns(3)
+
+    # In the first column, I will display missing values
+    with col1:
+        st.write("Missing Values")
+        st.write(diagnostics['missing_values'])
+        # I will also show the duplicate rows (unknown when the data was never all in memory)
+        duplicates = diagnostics['duplicates']
+        st.write("Duplicate Rows:", 'unknown' if duplicates is None else duplicates)
+
+    # In the second column, I will display summary of 'Records' column
+    with col2:
+        st.write("Records Summary")
+        st.write(diagnostics['records_summary'])
+
+    # In the third column, display the data types as strings in a DataFrame
+    with col3:
+        st.write("Data Types")
+        st.dataframe(diagnostics['raw_types'])
+
+    # Expain the key insights of data cleaninig step
+    st.info("""
+1. There are no missing values in any of the columns, meaning no null data processing is required.
+2. The Year column is shown as an object type, but for analysis purposes it must be an integer.
+3. There are no duplicate entries, so each row represents a unique data breach.
+4. The Records column is of type numeric (int64) and the summary shows a large variation in the number of
+records affected by violations, indicated by a large standard deviation.
+""")
+# =============================================================================
+
+
+
+# =============================================================================
+# Prepare Data
+# =============================================================================
+
+# The cleaning itself (integer 'Year', standardized 'Method', capitalized 'Organization type'
+# and 'Method') happens once in clean_breaches() for the dataset shared by all sessions, and the
+# canonical entities once per snapshot in entities.EntityResolver
+
+# Further data cleaning
+with st.expander("Data Preparation"), rerun_timer.section('Prepare'):
+
+    # Expain what the data preperation step shows
+    st.markdown("<h6 style='text-align: center;'>The data preperation process has revealed the following:</h6>",
+                unsafe_allow_html=True)
+
+    # Creating two columns with a ratio of 1:2
+    col1, col2 = st.columns([1,2])
+
+    # First column
+    with col1:
+        # I will write a title for the data types section
+        st.write("Cleaned Data Types")
+        # Display the cleaned data types as strings
+        st.dataframe(diagnostics['cleaned_types'])
+
+    # Second column
+    with col2:
+        # I will write a title for the Capitalized section
+        st.write("Capitalized First Letter for Organization type and Methods")
+        # I will display a sample of 5 rows of 'Organization type' and 'Method', the same rows on
+        # every rerun of this dataset version
+        st.dataframe(diagnostics['sample'])
+
+    # Expain the key insights of data preperation step & my upcoming steps
+    st.info("""
+1. I have converted the 'Year' column from an object type to an integer to enhance the analysis.
+2. I have also improved dataset readability and visual presentation by capitalizing the
+first letter of each word in the 'Organization Type' and 'Method' columns.
+3. I have converted the 'Records' column to millions once, so every chart uses the same unit, and stored
+the text columns as categories to keep the dataset compact.
+4. I have merged the different spellings of the same organization (such as 'Citigroup' and 'Citigroup Inc.')
+into one entity with its own id, so the graphs add up its breaches under one name. The names as they
+appear in the dataset stay in the 'Entity' column, next to the canonical 'Entity_canonical'.
+
+These, in brief, are the very initial basic steps aimed at the generation of an
+insightful data visualization for comprehensive analysis.
+""")
+# =============================================================================
+
+
+
+# =============================================================================
+# Rerun Timings
+# =============================================================================
+
+# I will log the timings of this rerun and show them in the sidebar when the debug panel is on
+finish_page(rerun_timer, timing_panel)
+# =============================================================================
@@ -0,0 +1,119 @@
+"""
+Annual Trend page of the data story: the users affected by the breaches per year.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from data_story import (figure_cache_key, finish_page, load_dataset, load_figure_cache, selected_year_range,
+                        sidebar_about, sidebar_filters, start_page)
+
+
+# I will time the sections of every rerun of this page (debug panel and timings.jsonl)
+rerun_timer = start_page('pages/2_Annual_Trend.py')
+
+# Load the dataset shared by all pages
+_, breaches_dataset = load_dataset(rerun_timer)
+breaches_cube = breaches_dataset.cube
+
+# Data Visualization title with CSS for centering
+st.markdown("<h2 style='text-align: center;'>Annual Trend</h2>",
+            unsafe_allow_html=True)
+
+# I will draw the filters of this page, kept in the session state while the reader switches pages
+filter_selection, _, _ = sidebar_filters(breaches_dataset)
+timing_panel = sidebar_about()
+
+# With the year range slider the totals, the method breakdown and Graph 1 come from the prefix sums
+# of the cube over the years, which answer any range with a few array subtractions
+year_range = selected_year_range()
+year_range_sums = breaches_cube.year_range_sums() if year_range else None
+
+# I will key the built figures on the canonical selection and the dataset version
+figure_cache = load_figure_cache()
+figure_key = figure_cache_key(breaches_dataset, filter_selection)
+
+
+
+# =============================================================================
+# Visualize Data Graph 1
+# =============================================================================
+
+# I will show the totals of the selection above the graph, from the same cube
+with rerun_timer.section('Totals'):
+    if year_range:
+        selection_totals = year_range_sums.totals(year_range, filter_selection)
+    else:
+        selection_totals = breaches_cube.totals(filter_selection)
+col1, col2, col3 = st.columns(3)
+col1.metric("Data Breaches", f"{selection_totals['Breaches']:,}")
+col2.metric("Users Affected", f"{selection_totals['Records']:,.0f}M")
+col3.metric("Largest Breach", f"{selection_totals['Largest']:,.0f}M")
+
+# I will summarize the breach sizes of the selection by merging the Records sketches of its cells
+# (the quartiles are approximate once a selection holds more than a few hundred breaches)
+with st.expander("Records summary of the selection (millions)"):
+    with rerun_timer.section('Records summary'):
+        selection_summary = pd.Series(breaches_cube.summary(filter_selection), name='Records', dtype='float64')
+    st.write(selection_summary)
+
+if year_range:
+    # I will break the year range down per method, from the same prefix sums
+    with st.expander(f"Breaches per method from {year_range[0]} to {year_range[1]}"):
+        with rerun_timer.section('Method breakdown') as section:
+            method_breakdown = year_range_sums.methods_breakdown(year_range, filter_selection)
+            section['rows'] = len(method_breakdown)
+        method_breakdown = method_breakdown.rename(columns={'Records': 'Records (millions)'})
+        st.dataframe(method_breakdown.style.format({'Records (millions)': '{:,.2f}'}))
+
+# I will sum up the 'Records' column (already in millions) per 'Year' of the selection, straight
+# from the pre-aggregated cube instead of grouping the filtered rows, with the breached organizations
+# per year from the merged entity sketches of its cells (no nunique over the rows), and build the area plot
+def build_graph1():
+    with rerun_timer.section('Graph 1 aggregation') as section:
+        if year_range:
+            # The distinct entities are not additive, they still come from the merged sketches
+            graph1 = year_range_sums.annual(year_range, filter_selection)[['Year', 'Records']]
+            graph1['Entities'] = graph1['Year'].map(breaches_cube.annual_entities(filter_selection))
+        else:
+            graph1 = breaches_cube.annual(filter_selection)[['Year', 'Records', 'Entities']]
+        section['rows'] = len(graph1)
+    with rerun_timer.section('Graph 1 figure build'):
+        from breaches.charts import annual_overview_figure
+        return annual_overview_figure(graph1)
+
+
+with rerun_timer.section('Graph 1 figure'):
+    fig = figure_cache.get_or_build(('graph1',) + figure_key, build_graph1)
+
+# I will display the Plotly graph in the Streamlit app
+with rerun_timer.section('Graph 1 render'):
+    st.plotly_chart(fig)
+
+# Expain my graph
+st.markdown("""
+The chart tells a long story of two huge peaks in 2013 with 3,469 million affected and the record year of 2019,
+with 3,824 million users. These two years, therefore, definitely urge a much closer look, and a look that involves
+more than just the company and its users:
+""")
+
+st.warning("""
+***1. Who were the users affected and through what means did their data
+get breached?***
+""")
+
+st.markdown("""
+I will take a deep dive to see what those companies were and what methods made them
+have big breaches in their systems that led to such huge exposure of user data.
+""")
+# =============================================================================
+
+
+
+# =============================================================================
+# Rerun Timings
+# =============================================================================
+
+# I will log the timings of this rerun and show them in the sidebar when the debug panel is on
+finish_page(rerun_timer, timing_panel)
+# =============================================================================
@@ -0,0 +1,87 @@
+"""
+Entities page of the data story: the biggest breaches per year by entity.
+"""
+
+import streamlit as st
+
+from data_story import (entity_search_results, figure_cache_key, finish_page, load_dataset, load_figure_cache,
+                        sidebar_about, sidebar_entity_search, sidebar_filters, start_page)
+
+
+# I will time the sections of every rerun of this page (debug panel and timings.jsonl)
+rerun_timer = start_page('pages/3_Entities.py')
+
+# Load the dataset shared by all pages
+_, breaches_dataset = load_dataset(rerun_timer)
+
+# Data Visualization title with CSS for centering
+st.markdown("<h2 style='text-align: center;'>Entities</h2>",
+            unsafe_allow_html=True)
+
+# I will draw the filters of this page, kept in the session state while the reader switches pages
+filter_selection, selected_filter_years, top_k_graph2 = sidebar_filters(
+    breaches_dataset, top_k=('Top Entities per Year (Graph 2):', 'top_k_graph2', 5))
+# I will let the reader search for an entity, the matches are highlighted in the graph
+searched_entities = sidebar_entity_search(breaches_dataset, rerun_timer)
+timing_panel = sidebar_about()
+
+# I will key the built figures on the canonical selection and the dataset version
+figure_cache = load_figure_cache()
+figure_key = figure_cache_key(breaches_dataset, filter_selection)
+
+
+
+# =============================================================================
+# Visualize Data Graph 2
+# =============================================================================
+
+# I will find the top K (5 by default) entities for each selected year and build the scatter plot
+def build_graph2():
+    with rerun_timer.section('Graph 2 aggregation') as section:
+        graph2 = breaches_dataset.top_entities(filter_selection, top_k_graph2)
+        section['rows'] = len(graph2)
+    with rerun_timer.section('Graph 2 figure build'):
+        from breaches.charts import entity_comparison_figure
+        return entity_comparison_figure(graph2, selected_filter_years)
+
+
+with rerun_timer.section('Graph 2 figure'):
+    fig2 = figure_cache.get_or_build(('graph2', top_k_graph2) + figure_key, build_graph2)
+    # The cached figure is the same for every search, the matches are outlined afterwards
+    if searched_entities:
+        from breaches.charts import highlight_entities
+        fig2 = highlight_entities(fig2, searched_entities)
+
+# I will display the Plotly graph in the Streamlit app
+with rerun_timer.section('Graph 2 render'):
+    st.plotly_chart(fig2)
+
+# I will list the breaches of the entities the search matched
+entity_search_results(breaches_dataset, searched_entities, rerun_timer)
+
+# Expain my graph
+st.markdown("""
+The graph of Comparative Analysis explains the Yahoo 2013 breach,
+hence the reason why it reached such a huge number of over 3 billion users.
+While 2019 brought multiple breaches at companies ranging from Facebook to Microsoft,
+the biggest in terms of its likely ultimate cost was Yahoo. All these illustrate a
+very different picture of the threat landscape, where the depth of breaches is
+not measured in terms of the number of users but rather in the frequency and variety.
+""")
+
+st.warning("""
+***To fully understand a cybersecurity failure, should we focus on analyzing the methods
+that enabled the root cause, since they likely created vulnerabilities that led to
+widespread security breaches?***
+""")
+# =============================================================================
+
+
+
+# =============================================================================
+# Rerun Timings
+# =============================================================================
+
+# I will log the timings of this rerun and show them in the sidebar when the debug panel is on
+finish_page(rerun_timer, timing_panel)
+# =============================================================================
@@ -0,0 +1,82 @@
+"""
+Methods page of the data story: the methods behind the biggest breaches per year.
+"""
+
+import streamlit as st
+
+from data_story import (entity_search_results, figure_cache_key, finish_page, load_dataset, load_figure_cache,
+                        sidebar_about, sidebar_entity_search, sidebar_filters, start_page)
+
+
+# I will time the sections of every rerun of this page (debug panel and timings.jsonl)
+rerun_timer = start_page('pages/4_Methods.py')
+
+# Load the dataset shared by all pages
+_, breaches_dataset = load_dataset(rerun_timer)
+
+# Data Visualization title with CSS for centering
+st.markdown("<h2 style='text-align: center;'>Methods</h2>",
+            unsafe_allow_html=True)
+
+# I will draw the filters of this page, kept in the session state while the reader switches pages
+filter_selection, _, top_k_graph3 = sidebar_filters(
+    breaches_dataset, top_k=('Top Breaches per Year (Graph 3):', 'top_k_graph3', 3))
+# I will let the reader search for an entity, the matches are highlighted in the graph
+searched_entities = sidebar_entity_search(breaches_dataset, rerun_timer)
+timing_panel = sidebar_about()
+
+# I will key the built figures on the canonical selection and the dataset version
+figure_cache = load_figure_cache()
+figure_key = figure_cache_key(breaches_dataset, filter_selection)
+
+
+
+# =============================================================================
+# Visualize Data Graph 3
+# =============================================================================
+
+# I will find the top K (3 by default) breaches for each selected year and build the stacked bar chart
+def build_graph3():
+    with rerun_timer.section('Graph 3 aggregation') as section:
+        graph3 = breaches_dataset.top_breaches(filter_selection, top_k_graph3)
+        section['rows'] = len(graph3)
+    with rerun_timer.section('Graph 3 figure build'):
+        from breaches.charts import method_comparison_figure
+        return method_comparison_figure(graph3)
+
+
+with rerun_timer.section('Graph 3 figure'):
+    fig3 = figure_cache.get_or_build(('graph3', top_k_graph3) + figure_key, build_graph3)
+    # The cached figure is the same for every search, the matches are outlined afterwards
+    if searched_entities:
+        from breaches.charts import highlight_entities
+        fig3 = highlight_entities(fig3, searched_entities)
+
+# I will display the Plotly graph in the Streamlit app
+with rerun_timer.section('Graph 3 render'):
+    st.plotly_chart(fig3)
+
+# I will list the breaches of the entities the search matched
+entity_search_results(breaches_dataset, searched_entities, rerun_timer)
+
+# Expain my graph
+st.markdown("""
+The 'Comparative Analysis' graph presents a detailed breakdown of data breaches by method.
+It had a hacking incident from Yahoo in 2013, which ranks as the highest breach ever,
+pointing towards a critical vulnerability even in the biggest technology companies.
+2019 was one of the years when such a mixed bag—from accidentally public data exposure to
+notably poor security and misconfigurations around the board—came to light.
+Indeed, from this multi-faceted picture, a clear emphasis emerges on just
+how greatly complicated the cybersecurity threats of the contemporary world have become.
+""")
+# =============================================================================
+
+
+
+# =============================================================================
+# Rerun Timings
+# =============================================================================
+
+# I will log the timings of this rerun and show them in the sidebar when the debug panel is on
+finish_page(rerun_timer, timing_panel)
+# =============================================================================
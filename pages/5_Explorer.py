@@ -0,0 +1,82 @@
+"""
+Explorer page of the data story: every breach of the filter selection, sorted and paged.
+"""
+
+import streamlit as st
+
+from breaches.explorer import EXPLORER_COLUMNS
+from data_story import finish_page, highlight_rows, load_dataset, sidebar_about, sidebar_filters, start_page
+
+
+# I will time the sections of every rerun of this page (debug panel and timings.jsonl)
+rerun_timer = start_page('pages/5_Explorer.py')
+
+# Load the dataset shared by all pages
+_, breaches_dataset = load_dataset(rerun_timer)
+
+# Data Explorer title with CSS for centering
+st.markdown("<h2 style='text-align: center;'>Explorer</h2>",
+            unsafe_allow_html=True)
+
+# I will draw the filters of this page, kept in the session state while the reader switches pages
+filter_selection, _, _ = sidebar_filters(breaches_dataset)
+timing_panel = sidebar_about()
+
+
+
+# =============================================================================
+# Explore Data
+# =============================================================================
+
+if not breaches_dataset.has_rows:
+    # With BREACHES_INGEST=stream only the aggregates of the charts are kept
+    st.info("The rows of the dataset are not kept in streaming mode, so there is nothing to explore.")
+else:
+    # I will let the reader sort by any column of the explorer
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort_by = col1.selectbox('Sort by:', EXPLORER_COLUMNS, index=EXPLORER_COLUMNS.index('Records'),
+                             key='explorer_sort_by')
+    ascending = col2.radio('Order:', ['Descending', 'Ascending'], key='explorer_order') == 'Ascending'
+    page_size = col3.selectbox('Rows per page:', [25, 50, 100], index=0, key='explorer_page_size')
+
+    # I will only fetch the rows of the visible page, sorted and paged by the dataset itself
+    # (only the rows up to the end of the page are sorted, not the whole selection)
+    page_number = st.session_state.get('explorer_page', 1)
+    with rerun_timer.section('Explorer page') as section:
+        page, total = breaches_dataset.page(filter_selection, sort_by, ascending,
+                                            (page_number - 1) * page_size, page_size)
+        page_count = max(1, -(-total // page_size))
+        if page_number > page_count:
+            # The selection got smaller than the page the reader was on, so I start over
+            page_number = st.session_state['explorer_page'] = 1
+            page, total = breaches_dataset.page(filter_selection, sort_by, ascending, 0, page_size)
+        section['rows'] = len(page)
+
+    # I will number the rows by their rank in the sorted selection and style only the visible page
+    page = page.rename(columns={'Records': 'Records (millions)'})
+    page.index = range((page_number - 1) * page_size + 1, (page_number - 1) * page_size + len(page) + 1)
+    with rerun_timer.section('Explorer render'):
+        if len(page) == 0:
+            # The Styler of pandas 1.4 cannot highlight the rows of an empty frame
+            st.info("No breaches match the selected filters.")
+        else:
+            st.dataframe(page.style.apply(highlight_rows, axis=0).format({'Records (millions)': '{:,.2f}'}))
+
+    # I will put the page navigation under the table
+    col1, col2 = st.columns([1, 3])
+    col1.number_input('Page:', min_value=1, max_value=page_count, step=1, key='explorer_page')
+    first_row = min(total, (page_number - 1) * page_size + 1)
+    col2.markdown(f"<p style='padding-top: 2.2em;'>Rows {first_row:,} to "
+                  f"{(page_number - 1) * page_size + len(page):,} of {total:,} breaches "
+                  f"({page_count:,} pages)</p>", unsafe_allow_html=True)
+# =============================================================================
+
+
+
+# =============================================================================
+# Rerun Timings
+# =============================================================================
+
+# I will log the timings of this rerun and show them in the sidebar when the debug panel is on
+finish_page(rerun_timer, timing_panel)
+# =============================================================================
@@ -0,0 +1,102 @@
+"""
+Conclusion page of the data story: my perspectives on the breaches and the conclusion.
+"""
+
+import streamlit as st
+
+from data_story import finish_page, sidebar_about, start_page
+
+
+# I will time the sections of every rerun of this page (debug panel and timings.jsonl)
+rerun_timer = start_page('pages/6_Conclusion.py')
+
+# This page only tells the story, it does not need the dataset
+timing_panel = sidebar_about()
+
+
+
+# =============================================================================
+# Data Perspective
+# =============================================================================
+
+# Personal Opinion title with CSS for centering
+st.markdown("<h2 style='text-align: center;'>Data Perspectives</h2>",
+            unsafe_allow_html=True)
+
+# Personal View
+st.markdown("""
+I have thought a lot about data breaches at big companies like Yahoo, Facebook, and Microsoft.
+The things that really get into me are not just the great sum of leaked data,
+but how many has been lost in trust and the ethics that are linked to it.
+"""
+)
+
+st.success("""
+**Philosophical**:
+***These data breaches was more than an email and phone number;
+this was about people and the invasion of their personal world - life without their consent.***
+
+**Ethically**:
+Ethically speaking, I believe one has to rise beyond the social norms and legal
+expectations with which these companies have failed to rise above.
+***It's not just breaking rules; it's failing to protect basic rights to which people
+should be entitled.***
+
+**Economically**:
+The data is valuable—maybe even tempting to exploit for personal profit.
+***But at what cost? To me, there is an ethically sound way through which
+data should be handled. It does not involve compromising privacy for financial gain.***
+
+**Technologically**:
+We are more connected than ever, and it is beautiful, but that comes with responsibility.
+The technology that unites us should not be the one that brings risks upon us.
+""")
+# =============================================================================
+
+
+
+# =============================================================================
+# Conclusion
+# =============================================================================
+
+# Conclusion title with CSS for centering
+st.markdown("<h2 style='text-align: center;'>Conclusion</h2>",
+            unsafe_allow_html=True)
+
+# Conclusion
+st.info("""
+In fact, looking at the big data breaches of the past years, for example,
+those at Yahoo in 2013 and others at Facebook and Microsoft in 2019, one really
+sees how big a deal data security really is. ***These are not numbers or statistics;
+these are real individuals whose most private data has been exposed.***
+
+The bottom line is that the companies with **our data really need good care.**
+**They have to be responsible because, when they screw it up, that's not a technical glitch;
+it's a betrayal of the user's trust.**
+
+There could be many reasons: ***at times, security is weak,
+and at other times, one shares, due to ignorance or by chance, what was meant to be kept secret.***
+This shows that even reputable large companies find it difficult to keep our data safe.
+
+***So, what is the most important conclusion from this data story?***
+
+**Companies must raise the bar in how they treat our personal data.**
+They really have to get their act together and reflect on what relevance it really
+has to safeguard privacy. It is more about doing the right thing and making sure
+they take care of the trust people place in them. ***In fact, today, it is almost a
+daily occurrence that data breaches happen.***
+
+This is a very good reminder to these companies to be super cautious with our data.
+
+""")
+# =============================================================================
+
+
+
+# =============================================================================
+# Rerun Timings
+# =============================================================================
+
+# I will log the timings of this rerun and show them in the sidebar when the debug panel is on
+finish_page(rerun_timer, timing_panel)
+# =============================================================================
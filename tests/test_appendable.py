@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from breaches.appendable import AppendableFrame
+
+
+def _batch(n, seed, methods=('Hacked', 'Poor Security')):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Year': rng.integers(2004, 2022, n).astype(np.int16),
+        'Records': rng.random(n).astype(np.float32),
+        'Method': pd.Categorical(rng.choice(methods, n)),
+    })
+
+
+def _values(frame):
+    # The values of every row, whatever the categories of the categorical columns
+    return frame.astype({'Method': object}).reset_index(drop=True)
+
+
+def test_appended_views_match_concat_and_earlier_views_stay_unchanged():
+    # 10 rows in buffers of exactly 10, grown to 20 by the first append and to 40 by the third
+    batches = [_batch(10, 0), _batch(3, 1), _batch(6, 2, ('Inside Job', 'Hacked')), _batch(5, 3), _batch(1, 4)]
+    columns = AppendableFrame.from_frame(batches[0])
+    views = [(columns.frame(), batches[0].copy())]
+    for i, batch in enumerate(batches[1:], 2):
+        columns = columns.append(batch)
+        views.append((columns.frame(), pd.concat(batches[:i], ignore_index=True)))
+
+    for view, expected in views:
+        # The earlier views still show their own rows, although later appends wrote behind them
+        pd.testing.assert_frame_equal(_values(view), _values(expected))
+    # The categories of the appended rows come behind the existing ones
+    assert list(columns.frame()['Method'].cat.categories) == ['Hacked', 'Poor Security', 'Inside Job']
+
+
+def test_append_to_an_older_version_does_not_touch_the_newer_one():
+    first = AppendableFrame.from_frame(_batch(4, 0))
+    newer = first.append(_batch(2, 1))
+    expected = _values(newer.frame()).copy()
+    other = first.append(_batch(3, 2))
+    pd.testing.assert_frame_equal(_values(newer.frame()), expected)
+    pd.testing.assert_frame_equal(_values(other.frame()),
+                                  _values(pd.concat([_batch(4, 0), _batch(3, 2)], ignore_index=True)))
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from breaches.cube import AggregationCube
+from breaches.dataset import clean_breaches
+from breaches.sketch import QuantileSketch
+
+
+def _raw():
+    return pd.DataFrame({
+        'Entity': ['Yahoo', 'Marriott International', 'Citigroup', 'Sony Pictures', 'Adobe'],
+        'Year': [2013, 2018, 2011, 2014, '2014 and 2015'],
+        'Records': [3_000_000_000, 500_000_000, 360_083, np.nan, 152_000_000],
+        'Organization type': ['web', np.nan, 'financial', 'media', 'tech'],
+        'Method': ['hacked', 'HACKED', np.nan, np.nan, 'hacked'],
+    })
+
+
+def test_missing_organization_type_and_method_read_nan():
+    cleaned = clean_breaches(_raw())
+    assert cleaned['Organization type'].tolist() == ['Web', 'Nan', 'Financial', 'Media']
+    assert cleaned['Method'].tolist() == ['Hacked', 'Hacked', 'Nan', 'Nan']
+
+
+def test_cube_keeps_every_row():
+    cleaned = clean_breaches(_raw())
+    cube = AggregationCube.build(cleaned)
+    totals = cube.totals({'Year': None, 'Organization type': None, 'Method': None})
+    assert totals['Breaches'] == len(cleaned)
+    assert totals['Records'] == cleaned['Records'].astype(np.float64).sum()
+    assert cube.annual({'Year': None, 'Organization type': None, 'Method': None})['Breaches'].sum() == len(cleaned)
+
+
+def test_combined_cube_keeps_every_row():
+    cleaned = clean_breaches(_raw())
+    parts = [AggregationCube.build(cleaned.iloc[:2]), AggregationCube.build(cleaned.iloc[2:])]
+    totals = AggregationCube.combine(parts).totals({'Year': None, 'Organization type': None, 'Method': ['Nan']})
+    assert totals['Breaches'] == 2
+
+
+def test_combine_merges_only_the_cells_of_the_appended_cube():
+    cleaned = clean_breaches(_raw())
+    # The appended rows add a breach to the first cell and a cell of their own
+    cleaned = pd.concat([cleaned, cleaned.iloc[[0]]], ignore_index=True)
+    cube = AggregationCube.build(cleaned.iloc[:3])
+    combined = AggregationCube.combine([cube, AggregationCube.build(cleaned.iloc[3:])])
+    rebuilt = AggregationCube.build(cleaned)
+    columns = ['Year', 'Organization type', 'Method', 'Breaches', 'Records', 'Largest']
+    pd.testing.assert_frame_equal(combined.cells[columns], rebuilt.cells[columns], check_categorical=False)
+    assert [s.to_dict() for s in combined.cells['Sketch']] == [s.to_dict() for s in rebuilt.cells['Sketch']]
+    # The two cells the appended rows do not touch keep their sketches
+    for column in ['Sketch', 'Entities']:
+        assert len(set(map(id, combined.cells[column])) & set(map(id, cube.cells[column]))) == 2
+
+
+def test_grouped_sketches_are_the_sketches_of_the_groups():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(10, 3, 5000)
+    values[::7] = np.nan
+    groups = rng.choice([-1, 0, 1, 3], len(values), p=[0.1, 0.8, 0.05, 0.05])
+    grouped = QuantileSketch.grouped(values, groups, 4)
+    for group, sketch in enumerate(grouped):
+        expected = QuantileSketch.of(values[groups == group])
+        assert sketch.count == expected.count
+        assert np.allclose([sketch.mean, sketch.m2], [expected.mean, expected.m2], equal_nan=True)
+        assert [np.sort(level).tolist() for level in sketch.levels] == \
+            [np.sort(level).tolist() for level in expected.levels]
+
+
+def test_rows_with_a_missing_key_are_left_out_of_the_cells():
+    cleaned = clean_breaches(_raw())
+    cleaned['Year'] = cleaned['Year'].astype(np.float64)
+    cleaned.loc[0, 'Year'] = np.nan
+    cleaned.loc[1, 'Method'] = np.nan
+    cube = AggregationCube.build(cleaned)
+    assert cube.cells['Breaches'].sum() == len(cleaned) - 2
+    assert sum(len(sketch) for sketch in cube.cells['Sketch']) == cube.cells['Breaches'].sum() - 1
+
+
+def test_year_range_sums_keep_the_nan_organization_type_and_method():
+    cube = AggregationCube.build(clean_breaches(_raw()))
+    sums = cube.year_range_sums()
+    everything = {'Organization type': None, 'Method': None}
+    assert sums.totals(sums.years, everything)['Breaches'] == cube.cells['Breaches'].sum()
+    assert sums.totals(sums.years, {'Organization type': None, 'Method': ['Nan']})['Breaches'] == 2
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from breaches.database import database_path, load_database
+from breaches.dataset import clean_breaches
+from breaches.entities import EntityResolver
+from breaches.store import BreachDataset
+
+
+def test_database_path_with_uri_characters(tmp_path):
+    # '?', '#' and '%' are URI syntax, the read-only connections have to quote them
+    folder = tmp_path / 'odd ?#% name'
+    folder.mkdir()
+    csv = folder / 'breaches.csv'
+    pd.DataFrame({
+        'Entity': ['Yahoo', 'Marriott International', 'Citigroup'],
+        'Year': [2013, 2018, 2011],
+        'Records': [3_000_000_000, 500_000_000, 360_083],
+        'Organization type': ['web', 'hotel', 'financial'],
+        'Method': ['hacked', 'hacked', 'poor security'],
+    }).to_csv(csv, index=False)
+
+    dataset = load_database([str(csv)], database_path(str(csv)), 'digest')
+    assert len(dataset) == 3
+    assert dataset.cube.totals({'Year': [2013, 2018], 'Organization type': None, 'Method': None})['Breaches'] == 2
+    # An unchanged CSV is served from the database file that is already there
+    assert len(load_database([str(csv)], database_path(str(csv)), 'digest')) == 3
+
+
+def test_database_reports_the_cleaned_dtypes_and_pages_like_the_frame(tmp_path):
+    csv = tmp_path / 'breaches.csv'
+    raw = pd.DataFrame({
+        'Entity': ['Yahoo', 'Marriott International', 'Citigroup', 'Sony Pictures', 'Adobe'],
+        'Year': [2013, 2018, 2011, 2014, 2013],
+        'Records': [3_000_000_000, 500_000_000, 360_083, None, 152_000_000],
+        'Organization type': ['web', 'hotel', 'financial', 'media', 'tech'],
+        'Method': ['hacked', 'hacked', 'poor security', 'hacked', 'hacked'],
+    })
+    raw.to_csv(csv, index=False)
+    dataset = load_database([str(csv)], database_path(str(csv)), 'digest')
+    memory = BreachDataset(EntityResolver().resolve(clean_breaches(raw)), {}, 'digest')
+
+    assert dataset.dtypes.astype(str).to_dict() == memory.dtypes.astype(str).to_dict()
+    for ascending in [True, False]:
+        page, total = dataset.page({}, 'Records', ascending, 0, 10)
+        expected, _ = memory.page({}, 'Records', ascending, 0, 10)
+        assert page['Entity'].tolist() == expected['Entity'].tolist()
+        # The breach without records comes last in both directions
+        assert page['Entity'].iloc[-1] == 'Sony Pictures'
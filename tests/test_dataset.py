@@ -0,0 +1,30 @@
+import os
+
+import pandas as pd
+
+from breaches.dataset import load_snapshot, snapshot_is_fresh
+
+
+def _write(path, entities):
+    pd.DataFrame({
+        'Entity': entities,
+        'Year': 2018,
+        'Records': 1_000_000,
+        'Organization type': 'web',
+        'Method': 'hacked',
+    }).to_csv(path, index=False)
+
+
+def test_csv_replaced_with_an_older_mtime_is_not_served_from_the_snapshot(tmp_path):
+    csv = tmp_path / 'breaches.csv'
+    _write(csv, ['Yahoo', 'Adobe'])
+    assert load_snapshot(str(csv))[0]['Entity'].tolist() == ['Yahoo', 'Adobe']
+    assert snapshot_is_fresh(str(csv))
+
+    # A restore from a backup: other rows, with an mtime older than the snapshot (as cp -p keeps it)
+    mtime_ns = os.stat(csv).st_mtime_ns
+    _write(csv, ['Yahoo', 'Adobe', 'Equifax'])
+    os.utime(csv, ns=(mtime_ns - 10 ** 9, mtime_ns - 10 ** 9))
+    assert not snapshot_is_fresh(str(csv))
+    assert load_snapshot(str(csv))[0]['Entity'].tolist() == ['Yahoo', 'Adobe', 'Equifax']
+    assert snapshot_is_fresh(str(csv))
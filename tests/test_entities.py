@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from breaches.dataset import clean_breaches, load_snapshot
+from breaches.entities import ENTITY_COLUMNS, EntityResolver
+from breaches.store import BreachDataset
+from breaches.synthetic import _entity_names
+
+
+def _raw(entities, year=2018):
+    return pd.DataFrame({
+        'Entity': entities,
+        'Year': year,
+        'Records': 1_000_000,
+        'Organization type': 'web',
+        'Method': 'hacked',
+    })
+
+
+def _entities(frame):
+    # Entity name -> its canonical columns
+    return {name: tuple(row) for name, *row in frame[['Entity'] + ENTITY_COLUMNS].drop_duplicates('Entity')
+            .itertuples(index=False)}
+
+
+@pytest.mark.parametrize('first, second', [
+    ('Citigroup', 'Citigroup Inc.'),
+    ('Marriott International', 'Marriot International'),
+    ('T-Mobile', 'T Mobile'),
+])
+def test_spellings_of_one_organization_are_merged(first, second):
+    resolver = EntityResolver()
+    resolver.add([first, second])
+    assert resolver.labels(first) == resolver.labels(second)
+
+
+@pytest.mark.parametrize('first, second', [
+    ('Global Health Inc. 1', 'Global Health Inc. 2'),
+    ('Sony Pictures 3', 'Sony Pictures 4'),
+    ('Sony Pictures 12', 'Sony Pictures 2'),
+    ('Global Health Group', 'Global Health Holdings'),
+    ('Yahoo', 'Yahoo Japan'),
+    ('Apex Data Systems', 'Apex Data Solutions'),
+])
+def test_distinct_organizations_stay_separate(first, second):
+    resolver = EntityResolver()
+    resolver.add([first, second])
+    assert resolver.labels(first)[2] != resolver.labels(second)[2]
+    assert resolver.labels(first)[1] != resolver.labels(second)[1]
+
+
+def test_numbered_synthetic_names_stay_separate():
+    # Every synthetic name differs in one of its words or in its number (legal suffixes aside)
+    names = _entity_names(np.arange(20_000))
+    resolver = EntityResolver()
+    resolver.add(names)
+    keys = {' '.join(name.replace('Inc.', '').replace('Corp', '').replace('Ltd', '').replace('Co.', '').split())
+            for name in names}
+    assert len(resolver) == len(keys)
+
+
+def test_canonical_name_is_the_most_frequent_spelling():
+    cleaned = EntityResolver().resolve(clean_breaches(_raw(['Citigroup Inc.', 'Citigroup', 'Citigroup', 'Yahoo'])))
+    # The raw names stay as they are, next to the canonical ones
+    assert cleaned['Entity'].tolist() == ['Citigroup Inc.', 'Citigroup', 'Citigroup', 'Yahoo']
+    assert cleaned['Entity_canonical'].tolist() == ['Citigroup', 'Citigroup', 'Citigroup', 'Yahoo']
+    assert cleaned['Entity_id'].iloc[0] == cleaned['Entity_id'].iloc[1] != cleaned['Entity_id'].iloc[3]
+
+
+def test_resolution_does_not_depend_on_the_order_of_the_names():
+    names = list(_entity_names(np.arange(3000))) + ['Marriott International', 'Marriot International']
+    counts = np.random.default_rng(0).integers(1, 5, len(names))
+    full = EntityResolver()
+    full.add(names, counts)
+    parts = EntityResolver()
+    for positions in np.array_split(np.random.default_rng(1).permutation(len(names)), 7):
+        parts.add([names[p] for p in positions], counts[positions])
+    assert all(parts.labels(name) == full.labels(name) for name in names)
+
+
+def test_append_gets_the_entities_of_a_reload(tmp_path):
+    rng = np.random.default_rng(0)
+    entities = list(_entity_names(rng.integers(0, 4000, 3000)))
+    # Spellings of one organization on both sides of the append, and rows that make 'Marriot'
+    # and 'Citigroup Inc.' the most frequent spellings only once they are appended
+    entities[:5] = ['Marriott International', 'Marriott International', 'Citigroup', 'Marriot International',
+                    'Citigroup Inc.']
+    entities[-3:] = ['Marriot International', 'Marriot International', 'Citigroup Inc.']
+    raw = _raw(entities, year=rng.integers(2004, 2022, len(entities)))
+    (tmp_path / 'first').mkdir()
+    (tmp_path / 'all').mkdir()
+    raw.iloc[:2000].to_csv(tmp_path / 'first' / 'breaches.csv', index=False)
+    raw.to_csv(tmp_path / 'all' / 'breaches.csv', index=False)
+
+    dataset = dataset_first = BreachDataset(*load_snapshot(str(tmp_path / 'first' / 'breaches.csv')), 'first')
+    for delta in np.array_split(raw.iloc[2000:], 3):
+        dataset = dataset.append(delta, 'appended')
+    appended = dataset.view()
+    reloaded = BreachDataset(*load_snapshot(str(tmp_path / 'all' / 'breaches.csv')), 'all').view()
+
+    assert _entities(appended) == _entities(reloaded)
+    for column in ENTITY_COLUMNS:
+        assert appended[column].tolist() == reloaded[column].tolist()
+    first = dataset_first.view()
+    assert first.loc[first['Entity'] == 'Marriot International', 'Entity_canonical'].iloc[0] == 'Marriott International'
+    assert appended.loc[appended['Entity'] == 'Marriott International', 'Entity_canonical'].iloc[0] == \
+        'Marriot International'
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from breaches.entity_search import EntityIndex, normalize
+from breaches.synthetic import _entity_names
+
+NAMES = list(_entity_names(np.arange(5000))) + ['Marriott International', 'Citigroup Inc.', 'Healthcare Partners',
+                                               'Yahoo', 'Yahoo Japan', 'Yahoo! Voices']
+
+
+def _brute_force(query, limit):
+    # Names starting with the query first, then names with a word starting with every query word,
+    # both in the order of their normalized names
+    keys = sorted(set(NAMES), key=normalize)
+    query = normalize(query)
+    prefix = [name for name in keys if normalize(name).startswith(query)]
+    words = [name for name in keys if name not in prefix
+             and all(any(word.startswith(part) for word in normalize(name).split()) for part in query.split())]
+    return (prefix + words)[:limit]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return EntityIndex.build(NAMES)
+
+
+@pytest.mark.parametrize('query', ['health', 'h', 'inc', 'int marr', 'global health inc 1', 'yahoo', '1 2',
+                                   'heal', 'g h', 'Yahoo!', 'zzz'])
+@pytest.mark.parametrize('limit', [1, 20, 100000])
+def test_search_matches_brute_force(index, query, limit):
+    assert index.search(query, limit) == _brute_force(query, limit)
+
+
+def test_empty_query(index):
+    assert index.search('  ') == []
+    assert index.search('yahoo', 0) == []
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from breaches.dataset import clean_breaches
+from breaches.entities import EntityResolver
+from breaches.explorer import EXPLORER_COLUMNS, page_positions
+from breaches.store import BreachDataset
+
+
+def _dataset():
+    raw = pd.DataFrame({
+        'Entity': ['Yahoo', 'Marriott International', 'Citigroup', 'Sony Pictures', 'Adobe', 'Equifax'],
+        'Year': [2013, 2018, 2011, 2014, 2013, 2017],
+        'Records': [3_000_000_000, 500_000_000, 360_083, np.nan, 152_000_000, 147_900_000],
+        'Organization type': ['web', 'hotel', 'financial', 'media', 'tech', 'financial'],
+        'Method': ['hacked', 'hacked', 'poor security', 'hacked', 'hacked', 'hacked'],
+    })
+    return BreachDataset(EntityResolver().resolve(clean_breaches(raw)), {}, 'test')
+
+
+def test_page_of_an_empty_selection_is_empty():
+    page, total = _dataset().page({'Year': [], 'Organization type': None, 'Method': None}, 'Records')
+    assert total == 0
+    assert len(page) == 0
+    assert page.columns.tolist() == EXPLORER_COLUMNS
+
+
+@pytest.mark.parametrize('sort_by', ['Records', 'Year', 'Entity', 'Method'])
+@pytest.mark.parametrize('ascending', [True, False])
+@pytest.mark.parametrize('selection', [None, {'Year': [2013, 2014, 2017]}, {'Method': ['Hacked']}])
+def test_pages_are_the_pages_of_the_sorted_selection(sort_by, ascending, selection):
+    dataset = _dataset()
+    rows = dataset.rows(selection or {})
+    # Ties in row order and missing values last, in both directions
+    expected = rows.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last',
+                                key=lambda column: column.astype(str) if column.dtype == 'category' else column)
+    for start in range(0, len(rows) + 2, 2):
+        page, total = dataset.page(selection or {}, sort_by, ascending, start, 2)
+        assert total == len(rows)
+        assert page.index.tolist() == expected.index[start:start + 2].tolist()
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+def test_page_positions_keep_the_ties_and_missing_values_in_row_order(ascending):
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.integers(0, 5, 1000).astype(np.float64))
+    values[rng.random(1000) < 0.2] = np.nan
+    mask = rng.random(1000) < 0.5
+    expected = values[mask].sort_values(ascending=ascending, kind='stable', na_position='last').index
+    for start in [0, 95, 390, 480]:
+        positions, total = page_positions(values, mask, start, 25, ascending)
+        assert total == mask.sum()
+        assert positions.tolist() == expected[start:start + 25].tolist()
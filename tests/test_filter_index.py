@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from breaches.filter_index import FILTER_COLUMNS, FilterIndex
+
+SELECTIONS = [
+    {'Year': None, 'Organization type': None, 'Method': None},
+    {'Year': [2013], 'Organization type': None, 'Method': None},
+    {'Year': [2011, 2013, 2030], 'Organization type': ['Web', 'Tech'], 'Method': None},
+    {'Year': None, 'Organization type': None, 'Method': ['Hacked', 'Lost']},
+    {'Year': [], 'Organization type': None, 'Method': None},
+]
+
+
+def _frame(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Year': rng.integers(2010, 2016, n).astype(np.int16),
+        'Organization type': pd.Categorical(rng.choice(['Web', 'Tech', 'Financial'], n)),
+        'Method': pd.Categorical(rng.choice(['Hacked', 'Poor Security', 'Lost'], n)),
+    })
+
+
+def _isin_mask(frame, selection):
+    mask = np.ones(len(frame), dtype=bool)
+    for column, values in selection.items():
+        if values is not None:
+            mask &= frame[column].isin(values).to_numpy()
+    return mask
+
+
+def _check(index, frame):
+    for selection in SELECTIONS:
+        mask = index.mask(selection)
+        expected = _isin_mask(frame, selection)
+        assert (mask if mask is not None else np.ones(len(frame), dtype=bool)).tolist() == expected.tolist()
+    assert all(index.values(column) == sorted(frame[column].unique()) for column in FILTER_COLUMNS)
+
+
+@pytest.mark.parametrize('sizes', [[13, 1, 7, 30], [16, 8], [5, 3, 200]])
+def test_mask_matches_isin_before_and_after_appends(sizes):
+    frames = [_frame(n, seed) for seed, n in enumerate(sizes)]
+    # A value that only shows up in an appended batch
+    frames[-1].loc[0, 'Year'] = 2030
+    index = FilterIndex.build(frames[0])
+    indexes = [(index, frames[0])]
+    for delta in frames[1:]:
+        # The batches end in the middle of a byte, so the new bits go into a partly filled word
+        index = index.append(delta)
+        indexes.append((index, pd.concat([indexes[-1][1], delta], ignore_index=True)))
+    for index, frame in indexes:
+        # The earlier indexes still read their own rows only
+        assert index.n_rows == len(frame)
+        _check(index, frame)
+
+
+def test_append_to_an_older_index_leaves_the_newer_one_as_it_is():
+    first = _frame(11, 0)
+    index = FilterIndex.build(first)
+    newer = index.append(_frame(5, 1))
+    # A second append to the same version goes into buffers of its own
+    other = index.append(_frame(9, 2))
+    _check(newer, pd.concat([first, _frame(5, 1)], ignore_index=True))
+    _check(other, pd.concat([first, _frame(9, 2)], ignore_index=True))
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from breaches.dataset import clean_breaches, snapshot_paths
+from breaches.entities import ENTITY_COLUMNS, EntityResolver
+from breaches.shards import load_shards, shard_paths
+
+
+def _raw(entities, year):
+    return pd.DataFrame({
+        'Entity': entities,
+        'Year': year,
+        'Records': 1_000_000,
+        'Organization type': 'web',
+        'Method': 'hacked',
+    })
+
+
+def test_shard_entities_are_resolved_once_over_all_shards(tmp_path):
+    # Two spellings of one organization, each in its own shard
+    _raw(['Marriott International', 'Yahoo'], 2018).to_csv(tmp_path / '2018.csv', index=False)
+    _raw(['Marriot International', 'Marriot International'], 2019).to_csv(tmp_path / '2019.csv', index=False)
+    paths = shard_paths(str(tmp_path))
+
+    frame, _ = load_shards(paths, workers=1, digest='digest')
+    # The shard snapshots are written without entities of their own
+    for path in paths:
+        assert not set(ENTITY_COLUMNS) & set(pd.read_parquet(snapshot_paths(path)[0]).columns)
+    assert frame['Entity_canonical'].tolist() == ['Marriot International', 'Yahoo', 'Marriot International',
+                                           'Marriot International']
+
+    raw = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+    expected = EntityResolver().resolve(clean_breaches(raw))
+    for column in ENTITY_COLUMNS:
+        assert frame[column].tolist() == expected[column].tolist()
+    # A second load reads the entity table of the dataset version back
+    again, _ = load_shards(paths, workers=1, digest='digest')
+    assert again['Entity_id'].tolist() == frame['Entity_id'].tolist()
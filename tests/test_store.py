@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from breaches.dataset import clean_breaches
+from breaches.store import freeze_frame
+
+
+def test_frozen_frame_rejects_writes():
+    frame = clean_breaches(pd.DataFrame({
+        'Entity': ['Yahoo', 'Adobe'],
+        'Year': [2013, 2013],
+        'Records': [3_000_000_000, 152_000_000],
+        'Organization type': ['web', 'tech'],
+        'Method': ['hacked', 'hacked'],
+    }))
+    frozen = freeze_frame(frame)
+    pd.testing.assert_frame_equal(frozen, frame)
+    first = frozen.index[0]
+    with pytest.raises(ValueError):
+        frozen.loc[first, 'Year'] = 2000
+    with pytest.raises(ValueError):
+        frozen.iloc[0, frozen.columns.get_loc('Records')] = 1.0
+    with pytest.raises(ValueError):
+        frozen['Records'].values[0] = 1.0
+    with pytest.raises(ValueError):
+        frozen.loc[first, 'Method'] = 'Hacked'
+    # The frame it was made from keeps its own (writable) arrays
+    frame.loc[first, 'Year'] = 2000
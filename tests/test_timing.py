@@ -0,0 +1,19 @@
+import json
+
+from breaches.timing import RerunTimer
+
+
+def test_timing_log_is_rotated_at_its_size_cap(tmp_path):
+    path = str(tmp_path / 'timings.jsonl')
+    for _ in range(20):
+        timer = RerunTimer('Streamlit.py')
+        with timer.section('Load'):
+            pass
+        timer.write_jsonl(path, max_bytes=1000)
+
+    # The current log and its single backup stay below the cap (plus one line)
+    sizes = [len(open(p).read()) for p in (path, path + '.1')]
+    line = len(json.dumps(timer.to_record(), default=str)) + 1
+    assert all(size < 1000 + line for size in sizes)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['timings.jsonl', 'timings.jsonl.1']
+
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from breaches.topk import top_k_per_group
+
+
+def _expected(frame, group, value, k):
+    # The pandas expression top_k_per_group stands for
+    return frame.dropna(subset=[value]).groupby(group, group_keys=False).apply(lambda rows: rows.nlargest(k, value))
+
+
+@pytest.mark.parametrize('k', [1, 3, 10])
+@pytest.mark.parametrize('categorical', [False, True])
+def test_top_k_per_group_matches_groupby_nlargest(k, categorical):
+    rng = np.random.default_rng(k)
+    # Few distinct values, so there are ties at every rank, groups of 1 to about 20 rows, and missing values
+    frame = pd.DataFrame({
+        'Year': rng.choice([2011, 2012, 2013, 2014, 2015], 60, p=[0.02, 0.08, 0.2, 0.3, 0.4]),
+        'Records': rng.integers(0, 4, 60).astype(np.float64),
+    }, index=rng.permutation(60))
+    frame.loc[frame.sample(8, random_state=k).index, 'Records'] = np.nan
+    # A group of a single row
+    frame.iloc[0, 0] = 2010
+    if categorical:
+        frame['Year'] = frame['Year'].astype('category')
+
+    top = top_k_per_group(frame, 'Year', 'Records', k)
+    expected = _expected(frame, 'Year', 'Records', k)
+    assert top.index.tolist() == expected.index.tolist()
+    assert top.groupby('Year', observed=True).size().max() <= k
+
+
+def test_top_k_per_group_of_an_empty_frame():
+    frame = pd.DataFrame({'Year': [], 'Records': []})
+    assert top_k_per_group(frame, 'Year', 'Records', 3).empty